@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Sub-anagram solver for Anagramarama
+Python counterpart of AnagramsManager.Ag: every dictionary word of 3 letters or more that can be
+built from a set of letters, sorted the way the game sorts its answers.
+"""
+
+import codecs
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+# AnagramsConstants.SPACE_CHAR: blank tile of a root shorter than 7 letters
+SPACE_CHAR = '#'
+BLANKS = (SPACE_CHAR, ' ')
+MIN_ANSWER_LENGTH = 3
+
+# Key under which a trie node stores the word ending there
+_WORD = ''
+
+
+# Bytes of the start of a wordlist its encoding is guessed from
+ENCODING_PREFIX = 1 << 16
+
+
+def wordlist_encoding(path: str) -> str:
+    """Encoding of a wordlist file, guessed from its first ENCODING_PREFIX bytes.
+
+    Most wordlists are utf-8, some (it, pt-BR) are still latin-1: fall back to it
+    rather than failing on the first accented letter. A file whose first accented
+    letters come later than that is taken for utf-8: readers fall back to latin-1
+    themselves if it is not (see decode_wordlist, word_pipeline.read_lines).
+    """
+    with open(path, 'rb') as f:
+        prefix = f.read(ENCODING_PREFIX)
+    try:
+        # Not final: the prefix may end in the middle of a character
+        codecs.getincrementaldecoder('utf-8')().decode(prefix)
+    except UnicodeDecodeError:
+        return 'latin-1'
+    return 'utf-8'
+
+
+def decode_wordlist(data: bytes) -> str:
+    """Text of a whole wordlist file: utf-8, or latin-1 if it is not valid utf-8."""
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        return data.decode('latin-1')
+
+
+def read_wordlist(path: str) -> List[str]:
+    """Read the words of a wordlist file, one per line, skipping blank lines."""
+    with open(path, 'rb') as f:
+        text = decode_wordlist(f.read())
+    return [line.strip('\r') for line in text.split('\n') if line.strip()]
+
+
+def game_sort_key(word: str) -> Tuple[int, str, str]:
+    """Order of AnagramsManager.Sort: by length, then alphabetically.
+
+    string.Compare is culture aware, so accented letters sort with their base letter.
+    """
+    folded = ''.join(c for c in unicodedata.normalize('NFD', word) if unicodedata.category(c) != 'Mn')
+    return len(word), folded.casefold(), word
+
+
+class AnagramSolver:
+    """Letter trie of a dictionary, walked with the letter counts of the root.
+
+    A branch is only followed while its letter is still available, so the walk never
+    leaves the words that can actually be built (unlike the permutations tried by Ag).
+    """
+
+    def __init__(self, words: Iterable[str], min_length: int = MIN_ANSWER_LENGTH):
+        """Build the trie, the words are used as they are (the game does not change their case)."""
+        self.min_length = min_length
+        self.root: Dict[str, Dict] = {}
+        self.word_count = 0
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str) -> None:
+        node = self.root
+        for letter in word:
+            node = node.setdefault(letter, {})
+        if _WORD not in node:
+            node[_WORD] = word
+            self.word_count += 1
+
+    def __contains__(self, word: str) -> bool:
+        node = self.root
+        for letter in word:
+            node = node.get(letter)
+            if node is None:
+                return False
+        return _WORD in node
+
+    def solve(self, letters: str) -> List[str]:
+        """All the words buildable from the letters, in game order.
+
+        Blanks ('#' SPACE_CHAR or ' ') are empty tiles: they do not stand for any letter.
+        """
+        counts = Counter(c for c in letters if c not in BLANKS)
+        found: List[str] = []
+        self._walk(self.root, counts, 0, found)
+        return sorted(found, key=game_sort_key)
+
+    def _walk(self, node: Dict[str, Dict], counts: Counter, depth: int, found: List[str]) -> None:
+        depth += 1
+        for letter, available in counts.items():
+            if not available:
+                continue
+            child = node.get(letter)
+            if child is None:
+                continue
+            if depth >= self.min_length and _WORD in child:
+                found.append(child[_WORD])
+            if len(child) > (_WORD in child):
+                counts[letter] = available - 1
+                self._walk(child, counts, depth, found)
+                counts[letter] = available
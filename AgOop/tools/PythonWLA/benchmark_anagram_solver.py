@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark of AnagramSolver against a straight port of the game's recursive AnagramsManager.Ag.
+Checks both give the same answers in the same order, then reports roots solved per second.
+
+Usage: python benchmark_anagram_solver.py [locale ...]
+"""
+
+import os
+import random
+import sys
+import time
+from typing import List, Set
+
+from anagram_solver import AnagramSolver, game_sort_key, read_wordlist
+
+LOCALES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'res', 'i18n')
+SAMPLE_SIZE = 300
+
+
+def ag(dictionary: Set[str], guess: str, remain: str, found: List[str]) -> None:
+    """AnagramsManager.Ag, line for line (found plays the part of the answers linked list)."""
+    total_len = len(guess) + len(remain)
+    new_guess = guess + remain[-1]
+    new_remain = remain[:-1]
+    if len(new_guess) > 3:
+        word = new_guess[1:]
+        if word in dictionary and word not in found:
+            found.append(word)
+    if new_remain:
+        ag(dictionary, new_guess, new_remain, found)
+        for i in range(total_len - 1, 0, -1):
+            if len(new_remain) > i:
+                new_remain = new_remain[1:] + new_remain[:1]
+                ag(dictionary, new_guess, new_remain, found)
+
+
+def solve_like_the_game(dictionary: Set[str], root: str) -> List[str]:
+    found: List[str] = []
+    # GetRandomWord appends the blank Ag starts from
+    ag(dictionary, '', root + ' ', found)
+    return sorted(found, key=game_sort_key)
+
+
+def main():
+    locales = sys.argv[1:] or ['en-GB', 'fr-FR', 'it']
+    rng = random.Random(1)
+    for locale in locales:
+        words = read_wordlist(os.path.join(LOCALES_DIR, locale, 'wordlist.txt'))
+        dictionary = set(words)
+        roots = sorted({w for w in words if len(w) == 7})
+        sample = rng.sample(roots, min(SAMPLE_SIZE, len(roots)))
+
+        start = time.perf_counter()
+        solver = AnagramSolver(words)
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        expected = [solve_like_the_game(dictionary, root) for root in sample]
+        ag_rate = len(sample) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        results = [solver.solve(root) for root in roots]
+        solver_rate = len(roots) / (time.perf_counter() - start)
+
+        solved = dict(zip(roots, results))
+        mismatches = sum(1 for root, answers in zip(sample, expected) if solved[root] != answers)
+
+        print(f"{locale}: {len(words)} words, trie built in {build_time:.2f}s")
+        print(f"    Ag port:       {ag_rate:>10,.0f} roots/s ({len(sample)} sampled roots)")
+        print(f"    AnagramSolver: {solver_rate:>10,.0f} roots/s ({len(roots)} roots)")
+        print(f"    mismatches against Ag: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Minimised DAWG of an Anagramarama dictionary
+Compiles a locale wordlist.txt (plus its supplementary_words.txt, if any) into a directed acyclic
+word graph: the Dlb_node trie of WordsList.LoadWordslist with its common suffixes merged as well
+as its common prefixes, written as a flat array of edges that can be memory mapped as it is.
+
+File layout (little endian):
+    header   magic b"AGDW", version u16, reserved u16, edge count u32, word count u32, node count u32
+    edges    edge count x (u32 letter | flags, u32 child), edge 0 is unused
+             letter: the character code point (bits 0-20)
+             flags:  FINAL (bit 30) a word ends with this letter, LAST (bit 31) last edge of its node
+             child:  first edge of the node the edge leads to, 0 if none
+The edges of a node are consecutive and sorted by letter, the root node starts at edge 1.
+"""
+
+import os
+import mmap
+import struct
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from anagram_solver import read_wordlist
+
+DAWG_MAGIC = b"AGDW"
+DAWG_VERSION = 1
+DAWG_FILE = "wordlist.agdawg"
+_HEADER = struct.Struct("<4sHHIII")
+
+LETTER_MASK = 0x1FFFFF
+FINAL = 1 << 30
+LAST = 1 << 31
+ROOT = 1
+
+LOCALES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'res', 'i18n')
+
+
+class _State:
+    """Node of the graph while it is built."""
+
+    __slots__ = ('children', 'final')
+
+    def __init__(self):
+        self.children: Dict[str, '_State'] = {}
+        self.final = False
+
+    def signature(self) -> Tuple:
+        """Equal for two nodes with the same future: they can be merged (children are already unique)."""
+        return self.final, tuple((letter, id(child)) for letter, child in self.children.items())
+
+
+def read_dictionary(locale_dir: str) -> List[str]:
+    """The words the game loads for a locale: wordlist.txt and supplementary_words.txt (without // comments)."""
+    words = read_wordlist(os.path.join(locale_dir, 'wordlist.txt'))
+    supplementary_file = os.path.join(locale_dir, 'supplementary_words.txt')
+    if os.path.exists(supplementary_file):
+        words += [w.strip() for w in read_wordlist(supplementary_file) if not w.strip().startswith('//')]
+    return words
+
+
+def build_dawg(words: Iterable[str]) -> Tuple[_State, int, int]:
+    """Minimised DAWG of the words, built in one pass over them in sorted order (Daciuk et al.).
+
+    Once a word is added, the nodes of the previous word past their common prefix can no longer
+    change: each is replaced by an equivalent node already registered, or registered itself.
+
+    Returns:
+        (root node, number of nodes, number of words)
+    """
+    root = _State()
+    register: Dict[Tuple, _State] = {}
+    # (parent, letter, child) of the last word's nodes not minimised yet
+    unchecked: List[Tuple[_State, str, _State]] = []
+
+    def minimise(down_to: int) -> None:
+        while len(unchecked) > down_to:
+            parent, letter, child = unchecked.pop()
+            signature = child.signature()
+            existing = register.get(signature)
+            if existing is None:
+                register[signature] = child
+            else:
+                parent.children[letter] = existing
+
+    previous = ''
+    word_count = 0
+    for word in sorted(set(words)):
+        common = 0
+        for a, b in zip(word, previous):
+            if a != b:
+                break
+            common += 1
+        minimise(common)
+        node = unchecked[-1][2] if unchecked else root
+        for letter in word[common:]:
+            child = _State()
+            node.children[letter] = child
+            unchecked.append((node, letter, child))
+            node = child
+        node.final = True
+        previous = word
+        word_count += 1
+    minimise(0)
+    return root, len(register) + 1, word_count
+
+
+def write_dawg(root: _State, node_count: int, word_count: int, dawg_path: str) -> Tuple[int, int]:
+    """Write the graph as a flat edge array.
+
+    Returns:
+        (number of edges, file size)
+    """
+    # Nodes that have children, breadth first from the root, and the first edge of each
+    order = [root]
+    seen = {id(root)}
+    for node in order:
+        for child in node.children.values():
+            if child.children and id(child) not in seen:
+                seen.add(id(child))
+                order.append(child)
+    first_edge: Dict[int, int] = {}
+    edge_count = ROOT
+    for node in order:
+        first_edge[id(node)] = edge_count
+        edge_count += len(node.children)
+
+    edges = [0, 0]
+    for node in order:
+        last = len(node.children) - 1
+        for i, (letter, child) in enumerate(sorted(node.children.items())):
+            flags = (FINAL if child.final else 0) | (LAST if i == last else 0)
+            edges.append(ord(letter) | flags)
+            edges.append(first_edge[id(child)] if child.children else 0)
+
+    tmp_path = dawg_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(DAWG_MAGIC, DAWG_VERSION, 0, edge_count, word_count, node_count))
+        f.write(struct.pack(f'<{len(edges)}I', *edges))
+    os.replace(tmp_path, dawg_path)
+    return edge_count - ROOT, os.path.getsize(dawg_path)
+
+
+class Dawg:
+    """Memory mapped reader of a DAWG file."""
+
+    def __init__(self, dawg_path: str):
+        self._file = open(dawg_path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, edge_count, self._word_count, self.node_count = _HEADER.unpack_from(self._map, 0)
+        if magic != DAWG_MAGIC or version != DAWG_VERSION:
+            raise ValueError(f"{dawg_path} is not a version {DAWG_VERSION} DAWG")
+        self._edges = memoryview(self._map)[_HEADER.size:_HEADER.size + 8 * edge_count].cast('I')
+        # First edge of the root node, none in an empty graph
+        self._root = ROOT if edge_count > ROOT else 0
+
+    def __len__(self) -> int:
+        return self._word_count
+
+    def _find_edge(self, node: int, letter: int) -> int:
+        """Edge of the node for that letter, 0 if there is none."""
+        edges = self._edges
+        while node:
+            value = edges[2 * node]
+            if value & LETTER_MASK == letter:
+                return node
+            if value & LAST:
+                break
+            node += 1
+        return 0
+
+    def _walk(self, prefix: str) -> int:
+        """Edge reached by the last letter of the prefix, 0 if no word starts with it."""
+        edge, node = 0, self._root
+        for letter in prefix:
+            edge = self._find_edge(node, ord(letter))
+            if not edge:
+                return 0
+            node = self._edges[2 * edge + 1]
+        return edge
+
+    def contains(self, word: str) -> bool:
+        edge = self._walk(word)
+        return bool(word) and bool(edge) and bool(self._edges[2 * edge] & FINAL)
+
+    __contains__ = contains
+
+    def iter_prefix(self, prefix: str = '') -> Iterator[str]:
+        """The words starting with the prefix, in sorted order."""
+        if prefix:
+            edge = self._walk(prefix)
+            if not edge:
+                return
+            if self._edges[2 * edge] & FINAL:
+                yield prefix
+            node = self._edges[2 * edge + 1]
+        else:
+            node = self._root
+        yield from self._iter_node(node, prefix)
+
+    def _iter_node(self, node: int, prefix: str) -> Iterator[str]:
+        edges = self._edges
+        # Depth first, the stack holds the next edge to visit at each depth
+        stack = [(node, prefix)] if node else []
+        while stack:
+            edge, word = stack.pop()
+            value, child = edges[2 * edge], edges[2 * edge + 1]
+            if not value & LAST:
+                stack.append((edge + 1, word))
+            word += chr(value & LETTER_MASK)
+            if value & FINAL:
+                yield word
+            if child:
+                stack.append((child, word))
+
+    def __iter__(self) -> Iterator[str]:
+        return self.iter_prefix()
+
+    def close(self):
+        self._edges.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    """Build the DAWG of each locale given on the command line (default: all of them)."""
+    locales = sys.argv[1:] or sorted(os.listdir(LOCALES_DIR))
+    print(f"{'locale':<8} {'words':>8} {'nodes':>8} {'edges':>8} {'bytes':>10} {'build':>7}")
+    for locale in locales:
+        locale_dir = os.path.join(LOCALES_DIR, locale)
+        if not os.path.exists(os.path.join(locale_dir, 'wordlist.txt')):
+            continue
+        dawg_path = os.path.join(locale_dir, DAWG_FILE)
+        start = time.perf_counter()
+        root, node_count, word_count = build_dawg(read_dictionary(locale_dir))
+        edge_count, size = write_dawg(root, node_count, word_count, dawg_path)
+        elapsed = time.perf_counter() - start
+        print(f"{locale:<8} {word_count:>8} {node_count:>8} {edge_count:>8} {size:>10} {elapsed:>6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+External-memory anagram grouping for the Wordlist Analyzer
+For dictionaries too large to group in memory: the (anagram key, word) entries are sorted in
+runs that fit a memory budget, each run is written to a temporary file, and the runs are then
+k-way merged back into one stream in key order, from which the groups come out one at a time.
+
+Run files hold one "key<TAB>word" line per entry (valid words never contain a tab or a newline).
+"""
+
+import heapq
+import os
+import shutil
+import sys
+import tempfile
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from word_pipeline import Entry, group_sorted
+
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+# Runs merged at once, more are first merged into larger runs
+MAX_MERGE_FAN_IN = 64
+PROGRESS_EVERY = 1_000_000
+
+# Rough memory taken by an entry kept in a run: the tuple and its list slot, plus the strings
+_ENTRY_OVERHEAD = sys.getsizeof((None, None)) + 8
+
+Progress = Optional[Callable[[str], None]]
+
+
+def write_sorted_runs(entries: Iterable[Entry], run_dir: str, memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                      progress: Progress = None) -> List[str]:
+    """Sort the entries by (key, word) in runs of at most memory_budget bytes, one file each."""
+    runs: List[str] = []
+    run: List[Tuple[str, str]] = []
+    size = 0
+    count = 0
+
+    def flush() -> None:
+        run.sort()
+        path = os.path.join(run_dir, f"run{len(runs):06d}.txt")
+        with open(path, 'w', encoding='utf-8', newline='\n') as f:
+            f.writelines(f"{key}\t{word}\n" for key, word in run)
+        runs.append(path)
+        if progress:
+            progress(f"run {len(runs)} written: {len(run):,} entries")
+        run.clear()
+
+    for word, key in entries:
+        run.append((key, word))
+        size += _ENTRY_OVERHEAD + sys.getsizeof(key) + sys.getsizeof(word)
+        count += 1
+        if size >= memory_budget:
+            flush()
+            size = 0
+        if progress and count % PROGRESS_EVERY == 0:
+            progress(f"{count:,} entries read")
+    if run or not runs:
+        flush()
+    return runs
+
+
+def _read_run(path: str) -> Iterator[Tuple[str, str]]:
+    with open(path, 'r', encoding='utf-8', newline='\n') as f:
+        for line in f:
+            key, word = line.rstrip('\n').split('\t')
+            yield key, word
+
+
+def merge_runs(runs: List[str], run_dir: str, progress: Progress = None) -> Iterator[Entry]:
+    """The entries of the sorted runs in (key, word) order, duplicates removed.
+
+    At most MAX_MERGE_FAN_IN files are open at once: beyond that, runs are first merged by
+    batches into larger runs, as many passes as needed.
+    """
+    passes = 0
+    while len(runs) > MAX_MERGE_FAN_IN:
+        passes += 1
+        merged: List[str] = []
+        for start in range(0, len(runs), MAX_MERGE_FAN_IN):
+            batch = runs[start:start + MAX_MERGE_FAN_IN]
+            path = os.path.join(run_dir, f"pass{passes}_{len(merged):06d}.txt")
+            with open(path, 'w', encoding='utf-8', newline='\n') as f:
+                f.writelines(f"{key}\t{word}\n" for key, word in heapq.merge(*map(_read_run, batch)))
+            for run in batch:
+                os.remove(run)
+            merged.append(path)
+        if progress:
+            progress(f"merge pass {passes}: {len(runs)} runs -> {len(merged)}")
+        runs = merged
+
+    if progress:
+        progress(f"merging {len(runs)} runs")
+    previous = None
+    for pair in heapq.merge(*map(_read_run, runs)):
+        if pair != previous:
+            yield Entry(pair[1], pair[0])
+            previous = pair
+
+
+def external_groups(entries: Iterable[Entry], memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                    tmp_dir: Optional[str] = None, progress: Progress = None) -> Iterator[Tuple[str, List[str]]]:
+    """(anagram key, sorted distinct words) of every group, in key order, spilling to disk.
+
+    Memory is bounded by memory_budget while sorting, then by one group while merging.
+    The temporary files are removed when the generator is exhausted or closed.
+    """
+    run_dir = tempfile.mkdtemp(prefix='anagram_runs_', dir=tmp_dir)
+    try:
+        runs = write_sorted_runs(entries, run_dir, memory_budget, progress)
+        groups = 0
+        for group in group_sorted(merge_runs(runs, run_dir, progress)):
+            groups += 1
+            if progress and groups % PROGRESS_EVERY == 0:
+                progress(f"{groups:,} groups merged")
+            yield group
+        if progress:
+            progress(f"{groups:,} groups in total")
+    finally:
+        shutil.rmtree(run_dir, ignore_errors=True)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Compiled word frequency cache for the Wordlist Analyzer
+The "word frequency" text lists are compiled once into a binary file that is memory mapped
+and searched in place: opening it costs no parsing and almost no memory. The binary file is
+compiled again whenever the text file it was made from changes (size or modification time).
+The words are a sorted table of fixed width, so that many words are looked up at once with
+one NumPy searchsorted over the mapped file (get_many).
+
+File layout (little endian):
+    header       magic b"AGFQ", version u16, reserved u16, word count u32,
+                 source size u64, source modification time (ns) u64, key width u32
+    frequencies  word count x f64
+    keys         word count x key width bytes, utf-8 words padded with NUL bytes, sorted
+                 (by bytes, i.e. by code point)
+"""
+
+import hashlib
+import os
+import mmap
+import struct
+import sys
+import time
+from typing import Dict, Iterator, List, Mapping, Optional
+
+import numpy as np
+
+CACHE_MAGIC = b"AGFQ"
+CACHE_VERSION = 2
+CACHE_EXTENSION = ".agfreq"
+_HEADER = struct.Struct("<4sHHIQQI")
+
+
+def parse_frequency_text(text_path: str) -> Dict[str, float]:
+    """The 'word frequency' lines of a text list."""
+    frequencies = {}
+    with open(text_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                word, freq = line.strip().split(' ')
+                frequencies[word] = float(freq)
+    return frequencies
+
+
+def compiled_path(text_path: str) -> str:
+    return os.path.splitext(text_path)[0] + CACHE_EXTENSION
+
+
+def build_frequency_cache(text_path: str, cache_path: Optional[str] = None) -> str:
+    """Compile the text list into cache_path (default: next to it). Returns the cache path."""
+    cache_path = cache_path or compiled_path(text_path)
+    source = os.stat(text_path)
+    frequencies = parse_frequency_text(text_path)
+    keys = sorted(word.encode('utf-8') for word in frequencies)
+    width = max(map(len, keys), default=1)
+
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, 0, len(keys), source.st_size, source.st_mtime_ns, width))
+        f.write(np.array([frequencies[key.decode('utf-8')] for key in keys], dtype='<f8').tobytes())
+        f.write(np.array(keys, dtype=f'S{width}').tobytes())
+    os.replace(tmp_path, cache_path)
+    return cache_path
+
+
+class FrequencyCache(Mapping[str, float]):
+    """Read-only word -> frequency mapping over a memory mapped compiled cache (binary search)."""
+
+    def __init__(self, cache_path: str):
+        self._file = open(cache_path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self._count, self.source_size, self.source_mtime_ns, width = _HEADER.unpack_from(self._map, 0)
+        if magic != CACHE_MAGIC or version != CACHE_VERSION:
+            self.close()
+            raise ValueError(f"{cache_path} is not a version {CACHE_VERSION} frequency cache")
+        # Views of the mapped file, nothing is copied
+        self._frequencies = np.frombuffer(self._map, dtype='<f8', count=self._count, offset=_HEADER.size)
+        self._keys = np.frombuffer(self._map, dtype=f'S{width}', count=self._count, offset=_HEADER.size + 8 * self._count)
+        self._width = width
+        self._digest: Optional[str] = None
+
+    def _find(self, word: str) -> int:
+        """Position of the word, -1 if it is not in the cache."""
+        key = word.encode('utf-8')
+        if len(key) > self._width:
+            return -1
+        i = int(np.searchsorted(self._keys, key))
+        return i if i < self._count and self._keys[i] == key else -1
+
+    def __getitem__(self, word: str) -> float:
+        i = self._find(word)
+        if i < 0:
+            raise KeyError(word)
+        return float(self._frequencies[i])
+
+    def __contains__(self, word: object) -> bool:
+        return isinstance(word, str) and self._find(word) >= 0
+
+    def get(self, word: str, default: Optional[float] = None) -> Optional[float]:
+        i = self._find(word)
+        return float(self._frequencies[i]) if i >= 0 else default
+
+    def get_many(self, words: List[str]) -> List[Optional[float]]:
+        """Frequencies of many words (None if absent), all searched at once in the sorted keys."""
+        if not words or not self._count:
+            return [None] * len(words)
+        keys = [word.encode('utf-8') for word in words]
+        # Longer than every key: cannot be found, and must not be truncated into a match
+        fits = np.array([len(key) <= self._width for key in keys])
+        targets = np.array(keys, dtype=f'S{self._width}')
+        positions = np.minimum(np.searchsorted(self._keys, targets), self._count - 1)
+        found = fits & (self._keys[positions] == targets)
+        frequencies = self._frequencies[positions].tolist()
+        return [frequency if ok else None for frequency, ok in zip(frequencies, found.tolist())]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self._keys:
+            yield key.decode('utf-8')
+
+    def digest(self) -> str:
+        """sha256 of the compiled data this cache reads from, whatever the files on disk became since."""
+        if self._digest is None:
+            self._digest = hashlib.sha256(self._map).hexdigest()
+        return self._digest
+
+    def is_stale(self, text_path: str) -> bool:
+        """True if the text list changed since the cache was compiled from it."""
+        source = os.stat(text_path)
+        return (source.st_size, source.st_mtime_ns) != (self.source_size, self.source_mtime_ns)
+
+    def close(self):
+        # The arrays hold the map's buffer: drop them first
+        self._frequencies = self._keys = None
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_frequency_cache(text_path: str) -> FrequencyCache:
+    """The compiled cache of a text list, compiled first if missing, out of date or unreadable."""
+    cache_path = compiled_path(text_path)
+    if os.path.exists(cache_path):
+        try:
+            cache = FrequencyCache(cache_path)
+        except (ValueError, struct.error, OSError):
+            pass
+        else:
+            if not cache.is_stale(text_path):
+                return cache
+            cache.close()
+    return FrequencyCache(build_frequency_cache(text_path, cache_path))
+
+
+def main():
+    """Compile the text lists given on the command line and time a cold open and lookups."""
+    for text_path in sys.argv[1:]:
+        start = time.perf_counter()
+        cache_path = build_frequency_cache(text_path)
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with FrequencyCache(cache_path) as cache:
+            open_time = time.perf_counter() - start
+            words = list(cache)[::97]
+            start = time.perf_counter()
+            for word in words:
+                cache[word]
+            lookup_time = (time.perf_counter() - start) / max(len(words), 1)
+            print(f"{text_path}: {len(cache)} words, {os.path.getsize(cache_path)} bytes, built in {build_time:.3f}s, "
+                  f"opened in {open_time * 1000:.2f}ms, {lookup_time * 1e6:.1f}us per lookup")
+
+
+if __name__ == "__main__":
+    main()
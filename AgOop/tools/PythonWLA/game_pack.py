@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Playable roots game pack for Anagramarama
+Precomputes, for every 7-letter word of a locale wordlist, all the answers the game would
+find for it (AnagramsManager.Ag), keeps only the roots the game accepts (6 to 77 answers)
+and writes them with their sorted answers to an indexed binary pack.
+
+Pack layout (little endian):
+    header   magic b"AGPK", version u16, root length u16, root count u32, index offset u32
+    records  per root: u8 byte length + utf-8 root, u16 answer count,
+             then per answer: u8 byte length + utf-8 answer (answers in game order)
+    index    root count x u32 record offsets, records sorted by root
+"""
+
+import os
+import mmap
+import random
+import struct
+import sys
+import time
+from collections import defaultdict
+from itertools import combinations
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from anagram_solver import MIN_ANSWER_LENGTH, game_sort_key, read_wordlist
+
+# Same rules as AnagramsManager.GetNewRootWordAndAnagramsList
+ROOT_LENGTH = 7          # AnagramsConstants.MAX_ANAGRAM_LENGTH
+MIN_ANSWERS = 6
+MAX_ANSWERS = 77
+
+PACK_MAGIC = b"AGPK"
+PACK_VERSION = 1
+PACK_FILE = "playable_roots.agpack"
+_HEADER = struct.Struct("<4sHHII")
+
+LOCALES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'res', 'i18n')
+
+
+def build_anagram_index(words: List[str]) -> Dict[str, List[str]]:
+    """Dictionary words grouped by their sorted letters."""
+    index: Dict[str, List[str]] = defaultdict(list)
+    for word in set(words):
+        index[''.join(sorted(word))].append(word)
+    return index
+
+
+def solve_root(root: str, index: Dict[str, List[str]]) -> List[str]:
+    """Every dictionary word of MIN_ANSWER_LENGTH letters or more made from the root letters, in game order.
+
+    Same result as the recursive Ag walk (and AnagramSolver.solve), but for whole roots looking up
+    each sub-multiset of the root letters by its sorted letters is quicker than walking a trie.
+    """
+    letters = sorted(root)
+    answers: Set[str] = set()
+    for length in range(MIN_ANSWER_LENGTH, len(letters) + 1):
+        for key in set(combinations(letters, length)):
+            answers.update(index.get(''.join(key), ()))
+    return sorted(answers, key=game_sort_key)
+
+
+def build_pack(wordlist_path: str, pack_path: str) -> Tuple[int, int]:
+    """Solve every root of the wordlist and write the playable ones to pack_path.
+
+    Returns:
+        (number of candidate roots, number of playable roots)
+    """
+    words = read_wordlist(wordlist_path)
+    index = build_anagram_index(words)
+    roots = sorted({w for w in words if len(w) == ROOT_LENGTH})
+
+    tmp_path = pack_path + '.tmp'
+    offsets: List[int] = []
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(PACK_MAGIC, PACK_VERSION, ROOT_LENGTH, 0, 0))
+        for root in roots:
+            answers = solve_root(root, index)
+            if not (MIN_ANSWERS <= len(answers) <= MAX_ANSWERS):
+                continue
+            offsets.append(f.tell())
+            record = [_short_string(root), struct.pack('<H', len(answers))]
+            record.extend(_short_string(a) for a in answers)
+            f.write(b''.join(record))
+
+        index_offset = f.tell()
+        f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+        f.seek(0)
+        f.write(_HEADER.pack(PACK_MAGIC, PACK_VERSION, ROOT_LENGTH, len(offsets), index_offset))
+    os.replace(tmp_path, pack_path)
+    return len(roots), len(offsets)
+
+
+def _short_string(word: str) -> bytes:
+    data = word.encode('utf-8')
+    return bytes((len(data),)) + data
+
+
+class GamePack:
+    """Random access reader of a playable roots pack, memory mapped."""
+
+    def __init__(self, pack_path: str):
+        self._file = open(pack_path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.root_length, self._count, index_offset = _HEADER.unpack_from(self._map, 0)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError(f"{pack_path} is not a version {PACK_VERSION} game pack")
+        self._index = memoryview(self._map)[index_offset:index_offset + 4 * self._count].cast('I')
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _read_string(self, offset: int) -> Tuple[str, int]:
+        length = self._map[offset]
+        return self._map[offset + 1:offset + 1 + length].decode('utf-8'), offset + 1 + length
+
+    def root(self, i: int) -> str:
+        """The i-th root (roots are sorted)."""
+        return self._read_string(self._index[i])[0]
+
+    def __getitem__(self, i: int) -> Tuple[str, List[str]]:
+        """The i-th root and its answers, in game order."""
+        root, offset = self._read_string(self._index[i])
+        (count,) = struct.unpack_from('<H', self._map, offset)
+        offset += 2
+        answers = []
+        for _ in range(count):
+            answer, offset = self._read_string(offset)
+            answers.append(answer)
+        return root, answers
+
+    def __iter__(self) -> Iterator[Tuple[str, List[str]]]:
+        for i in range(self._count):
+            yield self[i]
+
+    def random_root(self, rng: Optional[random.Random] = None) -> Tuple[str, List[str]]:
+        """A new game: a random playable root and its answers, in O(1)."""
+        return self[(rng or random).randrange(self._count)]
+
+    def find(self, root: str) -> Optional[List[str]]:
+        """Answers of a given root, or None if it is not playable (binary search over the index)."""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self.root(middle) < root:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and self.root(low) == root:
+            return self[low][1]
+        return None
+
+    def close(self):
+        self._index.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    """Build the pack of each locale given on the command line (default: all of them)."""
+    locales = sys.argv[1:] or sorted(os.listdir(LOCALES_DIR))
+    for locale in locales:
+        wordlist_path = os.path.join(LOCALES_DIR, locale, 'wordlist.txt')
+        if not os.path.exists(wordlist_path):
+            continue
+        pack_path = os.path.join(LOCALES_DIR, locale, PACK_FILE)
+        start = time.perf_counter()
+        candidates, playable = build_pack(wordlist_path, pack_path)
+        print(f"{locale}: {playable} playable roots out of {candidates} in {time.perf_counter() - start:.1f}s -> {pack_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Downloads of the frequency lists (WordFrequencyLoader.fetch_all) from a local stand-in server.
+
+Run with: python -m pytest test_frequency_download.py
+"""
+import hashlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from wordlist_analyzer import FrequencySource, WordFrequencyLoader
+
+BODY = b"maison 185035\nchat 9120\n"
+ETAG = '"v1"'
+
+
+class FrequencyListHandler(BaseHTTPRequestHandler):
+    """Serves BODY at /list.txt (304 to a matching If-None-Match), a malformed list at
+    /malformed.txt and BODY with a Content-Length longer than it at /truncated.txt."""
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append((self.path, self.headers.get('If-None-Match')))
+        if self.path == '/list.txt' and self.headers.get('If-None-Match') == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body, length = {
+            '/list.txt': (BODY, len(BODY)),
+            '/malformed.txt': (b"maison 185035\nchat\n", 19),
+            '/truncated.txt': (BODY, len(BODY) + 100),
+        }.get(self.path, (None, 0))
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', str(length))
+        self.send_header('ETag', ETAG)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    FrequencyListHandler.requests_seen = []
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), FrequencyListHandler)
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def fetch(monkeypatch, cache_dir, url, sha256=None):
+    monkeypatch.setattr(WordFrequencyLoader, 'FREQUENCY_SOURCES',
+                        {'fr-FR': FrequencySource(url, "french_frequency.txt", sha256)})
+    return WordFrequencyLoader.fetch_all(str(cache_dir))['fr-FR']
+
+
+def test_downloads_then_revalidates(server, monkeypatch, tmp_path):
+    assert fetch(monkeypatch, tmp_path, f"{server}/list.txt") == 'downloaded'
+    assert (tmp_path / "french_frequency.txt").read_text(encoding='utf-8') == "maison 185035.0\nchat 9120.0\n"
+    meta = json.loads((tmp_path / "french_frequency.txt.meta.json").read_text(encoding='utf-8'))
+    assert meta['etag'] == ETAG and meta['sha256'] == hashlib.sha256(BODY).hexdigest()
+
+    assert fetch(monkeypatch, tmp_path, f"{server}/list.txt") == 'not modified'
+    assert FrequencyListHandler.requests_seen == [('/list.txt', None), ('/list.txt', ETAG)]
+    assert (tmp_path / "french_frequency.txt").read_text(encoding='utf-8') == "maison 185035.0\nchat 9120.0\n"
+
+
+def test_checksum_checked_when_pinned(server, monkeypatch, tmp_path):
+    sha256 = hashlib.sha256(BODY).hexdigest()
+    assert fetch(monkeypatch, tmp_path, f"{server}/list.txt", sha256) == 'downloaded'
+
+
+@pytest.mark.parametrize("path, sha256, reason", [
+    ("/missing.txt", None, "404"),
+    ("/malformed.txt", None, "unpack"),
+    ("/list.txt", "0" * 64, "checksum mismatch"),
+    ("/truncated.txt", None, "IncompleteRead"),
+])
+def test_failed_download_leaves_no_cache(server, monkeypatch, tmp_path, path, sha256, reason):
+    status = fetch(monkeypatch, tmp_path, f"{server}{path}", sha256)
+
+    assert status.startswith("failed: ") and reason in status
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Streaming word pipeline for the Wordlist Analyzer
+Loading a wordlist as a chain of generators, each pulling one line at a time from the previous:
+
+    read_lines -> skip_comments -> normalize -> validate -> (group_sorted) -> sinks
+
+Nothing is kept by the stages themselves: memory is what the sinks at the end choose to keep
+(a few counters for statistics, the words themselves for a WordStore).
+"""
+
+from collections import Counter
+from itertools import groupby, islice
+from typing import Iterable, Iterator, List, NamedTuple, Tuple
+
+from anagram_solver import wordlist_encoding
+
+
+class Entry(NamedTuple):
+    """A valid word of the list and its anagram key."""
+    word: str
+    key: str
+
+
+def read_lines(path: str) -> Iterator[str]:
+    """Lines of a wordlist file, lazily, the file read once.
+
+    The encoding is guessed from the start of the file (see wordlist_encoding). If a later line
+    turns out not to be utf-8, the file goes on as latin-1 from that line.
+    """
+    read = 0
+    try:
+        with open(path, 'r', encoding=wordlist_encoding(path)) as f:
+            for line in f:
+                yield line
+                read += 1
+        return
+    except UnicodeDecodeError:
+        pass
+    with open(path, 'r', encoding='latin-1') as f:
+        yield from islice(f, read, None)
+
+
+def skip_comments(lines: Iterable[str]) -> Iterator[str]:
+    """Stripped lines, without blank lines and '//' comments."""
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith('//'):
+            yield line
+
+
+def normalize(words: Iterable[str], normalizer) -> Iterator[Tuple[str, Tuple[str, bool, int]]]:
+    """(word, (anagram key, letters only, length)) of each word, from a WordNormalizer (not memoised)."""
+    for word in words:
+        yield word, normalizer.normalize(word, remember=False)
+
+
+def validate(normalized: Iterable[Tuple[str, Tuple[str, bool, int]]],
+             min_length: int, max_length: int) -> Iterator[Entry]:
+    """The game words among them: letters (or '-') only, min_length to max_length long."""
+    for word, (key, letters_only, length) in normalized:
+        if letters_only and min_length <= length <= max_length:
+            yield Entry(word, key)
+
+
+def group_sorted(entries: Iterable[Entry]) -> Iterator[Tuple[str, List[str]]]:
+    """(anagram key, distinct words) of entries already sorted by key: one group in memory at a time."""
+    for key, same_key in groupby(entries, key=lambda entry: entry.key):
+        yield key, sorted({entry.word for entry in same_key})
+
+
+def consume(entries: Iterable[Entry], *sinks) -> None:
+    """Feed every entry to each sink (an object with add(entry)), in one pass."""
+    adds = [sink.add for sink in sinks]
+    for entry in entries:
+        for add in adds:
+            add(entry)
+
+
+def tap(entries: Iterable[Entry], *sinks) -> Iterator[Entry]:
+    """The entries, unchanged, also fed to each sink as they pass (consume() for a stream going on)."""
+    adds = [sink.add for sink in sinks]
+    for entry in entries:
+        for add in adds:
+            add(entry)
+        yield entry
+
+
+class LengthCounts(Counter):
+    """Sink: number of valid lines of each length (duplicates counted, as WordlistAnalyzer.word_lengths)."""
+
+    def add(self, entry: Entry) -> None:
+        self[len(entry.word)] += 1
+
+
+class GroupSizes:
+    """Sink: anagram group size distribution (keeps the distinct words, to count each once)."""
+
+    def __init__(self):
+        self.seen = set()
+        self.group_sizes: Counter = Counter()
+
+    def add(self, entry: Entry) -> None:
+        if entry.word not in self.seen:
+            self.seen.add(entry.word)
+            self.group_sizes[entry.key] += 1
+
+    def distribution(self) -> Counter:
+        """Number of groups of each size."""
+        return Counter(self.group_sizes.values())
+
+
+class Pairs(list):
+    """Sink: the (anagram key, word) pairs a WordStore is built from."""
+
+    def add(self, entry: Entry) -> None:
+        self.append((entry.key, entry.word))
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Compact word store for the Wordlist Analyzer
+The words of a list kept in one contiguous utf-8 buffer with an offsets array instead of one
+str object each. Words are identified by integer IDs, given in (anagram key, word) order, so
+that every anagram group is a range of consecutive IDs.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+
+def _index_dtype(largest: int) -> type:
+    """Narrowest integer type for offsets and IDs up to largest."""
+    return np.uint32 if largest < 2 ** 32 else np.int64
+
+
+def _offsets(sizes: List[np.ndarray]) -> np.ndarray:
+    """The (len + 1) offsets of consecutive pieces of those sizes."""
+    sizes = np.concatenate(sizes) if sizes else np.zeros(0, dtype=np.int64)
+    offsets = np.zeros(len(sizes) + 1, dtype=_index_dtype(int(sizes.sum())))
+    np.cumsum(sizes, out=offsets[1:])
+    return offsets
+
+
+def _byte_order(blob: bytes, offsets: np.ndarray) -> np.ndarray:
+    """Indices that sort the strings of a packed buffer bytewise, without a Python object per string."""
+    sizes = np.diff(offsets.astype(np.int64))
+    width = max(int(sizes.max()) if len(sizes) else 0, 1)
+    # One NUL padded row per string: the cells inside the strings, in row order, are the buffer itself
+    table = np.zeros((len(sizes), width), dtype=np.uint8)
+    table[np.arange(width) < sizes[:, None]] = np.frombuffer(blob, dtype=np.uint8)
+    return np.argsort(table.view(f'S{width}').ravel(), kind='stable')
+
+
+class WordStore:
+    """Read-only set of words with integer IDs and anagram groups as ID ranges.
+
+    Iterating gives the words in ID order, `in` and id() search a by-word index (binary search).
+    """
+
+    def __init__(self, pairs: Iterable[Tuple[str, str]], presorted: bool = False):
+        """
+        Args:
+            pairs: (anagram key, word) of every word, duplicates allowed, in any order
+            presorted: the pairs are already sorted (str order, e.g. list.sort() in place):
+                they are then streamed into the buffers, no copy of them is made
+        """
+        if not presorted:
+            pairs = sorted(pairs)
+        # Packed as they come: str order is code point order, the order of the utf-8 bytes
+        blob, key_blob = bytearray(), bytearray()
+        word_sizes, key_sizes, group_sizes = array('q'), array('q'), array('q')
+        lengths = array('H')
+        previous_key = previous_word = None
+        for key, word in pairs:
+            if key == previous_key:
+                if word == previous_word:
+                    continue
+                group_sizes[-1] += 1
+            else:
+                encoded = key.encode('utf-8')
+                key_blob += encoded
+                key_sizes.append(len(encoded))
+                group_sizes.append(1)
+                previous_key = key
+            encoded = word.encode('utf-8')
+            blob += encoded
+            word_sizes.append(len(encoded))
+            lengths.append(len(word))
+            previous_word = word
+
+        count = len(word_sizes)
+        self._blob = bytes(blob)
+        self._offsets = _offsets([np.frombuffer(word_sizes, dtype=np.int64)])
+        self.lengths = np.frombuffer(lengths, dtype=np.uint16).copy()
+        # First ID of each group (and the end of the last one), and the key of each group
+        self.group_starts = _offsets([np.frombuffer(group_sizes, dtype=np.int64)]).astype(_index_dtype(count))
+        self._key_blob = bytes(key_blob)
+        self._key_offsets = _offsets([np.frombuffer(key_sizes, dtype=np.int64)])
+
+        # IDs in word order, for lookups
+        self._by_word = _byte_order(self._blob, self._offsets).astype(_index_dtype(count))
+        self.groups = AnagramGroups(self)
+
+    @classmethod
+    def from_words(cls, words: Iterable[str], key: Callable[[str], str]) -> 'WordStore':
+        return cls((key(word), word) for word in words)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Everything the store is made of, as arrays (to save it, see from_arrays)."""
+        return {
+            'blob': np.frombuffer(self._blob, dtype=np.uint8),
+            'offsets': self._offsets,
+            'lengths': self.lengths,
+            'group_starts': self.group_starts,
+            'key_blob': np.frombuffer(self._key_blob, dtype=np.uint8),
+            'key_offsets': self._key_offsets,
+            'by_word': self._by_word,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Mapping[str, np.ndarray]) -> 'WordStore':
+        """The store back from to_arrays(), without sorting or grouping anything again."""
+        store = cls.__new__(cls)
+        store._blob = arrays['blob'].tobytes()
+        store._offsets = arrays['offsets']
+        store.lengths = arrays['lengths']
+        store.group_starts = arrays['group_starts']
+        store._key_blob = arrays['key_blob'].tobytes()
+        store._key_offsets = arrays['key_offsets']
+        store._by_word = arrays['by_word']
+        store.groups = AnagramGroups(store)
+        return store
+
+    def updated(self, added: Iterable[Tuple[str, str]], removed: Iterable[Tuple[str, str]]) -> Tuple['WordStore', np.ndarray]:
+        """A new store with those (anagram key, word) pairs added and removed.
+
+        Only the groups of the keys concerned are decoded and rebuilt, the others are copied over
+        as slices of the buffers (their IDs shift, their order does not change).
+
+        Returns:
+            (new store, ID in this store of every new ID, -1 for the words added)
+        """
+        changes: Dict[bytes, Tuple[set, set]] = {}
+        for pairs, side in ((added, 0), (removed, 1)):
+            for key, word in pairs:
+                changes.setdefault(key.encode('utf-8'), (set(), set()))[side].add(word.encode('utf-8'))
+
+        # The new store in pieces, in key order: ranges of groups kept as they are, and rebuilt groups
+        sources: List[np.ndarray] = []
+        words: List[bytes] = []
+        word_sizes: List[np.ndarray] = []
+        char_lengths: List[np.ndarray] = []
+        group_sizes: List[np.ndarray] = []
+        keys: List[bytes] = []
+        key_sizes: List[np.ndarray] = []
+        old_word_sizes = np.diff(self._offsets.astype(np.int64))
+        old_group_sizes = np.diff(self.group_starts.astype(np.int64))
+        old_key_sizes = np.diff(self._key_offsets.astype(np.int64))
+
+        def keep(g0: int, g1: int) -> None:
+            if g1 <= g0:
+                return
+            i0, i1 = int(self.group_starts[g0]), int(self.group_starts[g1])
+            sources.append(np.arange(i0, i1, dtype=np.int64))
+            words.append(self._blob[self._offsets[i0]:self._offsets[i1]])
+            word_sizes.append(old_word_sizes[i0:i1])
+            char_lengths.append(self.lengths[i0:i1])
+            group_sizes.append(old_group_sizes[g0:g1])
+            keys.append(self._key_blob[self._key_offsets[g0]:self._key_offsets[g1]])
+            key_sizes.append(old_key_sizes[g0:g1])
+
+        kept_from = 0
+        for key in sorted(changes):
+            g = self._group_position(key)
+            found = g < self.group_count and self._group_key_bytes(g) == key
+            keep(kept_from, g)
+            kept_from = g + found
+
+            previous = {self._word_bytes(i): i for i in self.group_ids(g)} if found else {}
+            new_words, old_words = changes[key]
+            group_words = sorted((previous.keys() - old_words) | new_words)
+            if not group_words:
+                continue
+            sources.append(np.array([previous.get(word, -1) for word in group_words], dtype=np.int64))
+            words.append(b''.join(group_words))
+            word_sizes.append(np.array([len(word) for word in group_words], dtype=np.int64))
+            char_lengths.append(np.array([len(word.decode('utf-8')) for word in group_words], dtype=np.uint16))
+            group_sizes.append(np.array([len(group_words)], dtype=np.int64))
+            keys.append(key)
+            key_sizes.append(np.array([len(key)], dtype=np.int64))
+        keep(kept_from, self.group_count)
+
+        store = WordStore.__new__(WordStore)
+        source = np.concatenate(sources) if sources else np.zeros(0, dtype=np.int64)
+        store._blob = b''.join(words)
+        store._offsets = _offsets(word_sizes)
+        store.lengths = np.concatenate(char_lengths) if char_lengths else np.zeros(0, dtype=np.uint16)
+        store.group_starts = _offsets(group_sizes).astype(_index_dtype(len(source)))
+        store._key_blob = b''.join(keys)
+        store._key_offsets = _offsets(key_sizes)
+
+        # The by-word order of the words kept, with the words added inserted where they belong
+        new_ids = np.full(len(self), -1, dtype=np.int64)
+        kept = np.flatnonzero(source >= 0)
+        new_ids[source[kept]] = kept
+        by_word = new_ids[self._by_word.astype(np.int64)]
+        by_word = by_word[by_word >= 0]
+        inserted = sorted(np.flatnonzero(source < 0).tolist(), key=store._word_bytes)
+        positions = [bisect_left(range(len(by_word)), store._word_bytes(i), key=lambda j: store._word_bytes(by_word[j]))
+                     for i in inserted]
+        store._by_word = np.insert(by_word, positions, inserted).astype(_index_dtype(len(source)))
+        store.groups = AnagramGroups(store)
+        return store, source
+
+    def key_letters(self) -> str:
+        """The characters used by the anagram keys, sorted."""
+        return ''.join(sorted(set(self._key_blob.decode('utf-8'))))
+
+    def _word_bytes(self, i: int) -> bytes:
+        return self._blob[self._offsets[i]:self._offsets[i + 1]]
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return self._word_bytes(i).decode('utf-8')
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def id(self, word: str) -> int:
+        """ID of the word, -1 if it is not in the store."""
+        target = word.encode('utf-8')
+        position = bisect_left(range(len(self)), target, key=lambda j: self._word_bytes(self._by_word[j]))
+        if position < len(self) and self._word_bytes(self._by_word[position]) == target:
+            return int(self._by_word[position])
+        return -1
+
+    def __contains__(self, word: object) -> bool:
+        return isinstance(word, str) and self.id(word) >= 0
+
+    @property
+    def group_count(self) -> int:
+        return len(self.group_starts) - 1
+
+    def _group_key_bytes(self, g: int) -> bytes:
+        return self._key_blob[self._key_offsets[g]:self._key_offsets[g + 1]]
+
+    def group_key(self, g: int) -> str:
+        return self._group_key_bytes(g).decode('utf-8')
+
+    def _group_position(self, key: bytes) -> int:
+        """Index of the first group whose key is not below key (groups are sorted by key)."""
+        return bisect_left(range(self.group_count), key, key=self._group_key_bytes)
+
+    def group_ids(self, g: int) -> range:
+        return range(int(self.group_starts[g]), int(self.group_starts[g + 1]))
+
+    def find_group(self, key: str) -> int:
+        """Index of the group of that anagram key, -1 if there is none (groups are sorted by key)."""
+        target = key.encode('utf-8')
+        g = self._group_position(target)
+        if g < self.group_count and self._group_key_bytes(g) == target:
+            return g
+        return -1
+
+    def iter_groups(self) -> Iterator[Tuple[str, range]]:
+        """(anagram key, word IDs) of every group, in key order."""
+        for g in range(self.group_count):
+            yield self.group_key(g), self.group_ids(g)
+
+    def length_counts(self) -> Dict[int, int]:
+        """Number of words of each length."""
+        counts = np.bincount(self.lengths)
+        return {length: int(count) for length, count in enumerate(counts) if count}
+
+    def nbytes(self) -> int:
+        """Memory taken by the buffers and arrays."""
+        arrays = (self._offsets, self.lengths, self.group_starts, self._key_offsets, self._by_word)
+        return len(self._blob) + len(self._key_blob) + sum(a.nbytes for a in arrays)
+
+
+class AnagramGroups(Mapping[str, List[str]]):
+    """anagram key -> words view of a WordStore, the words of a group are decoded when asked for."""
+
+    def __init__(self, store: WordStore):
+        self._store = store
+
+    def __getitem__(self, key: str) -> List[str]:
+        g = self._store.find_group(key)
+        if g < 0:
+            raise KeyError(key)
+        return [self._store[i] for i in self._store.group_ids(g)]
+
+    def __len__(self) -> int:
+        return self._store.group_count
+
+    def __iter__(self) -> Iterator[str]:
+        for g in range(self._store.group_count):
+            yield self._store.group_key(g)
+
+    def items(self) -> Iterator[Tuple[str, List[str]]]:
+        """(key, words) of every group, in key order, without a lookup per key."""
+        for key, ids in self._store.iter_groups():
+            yield key, [self._store[i] for i in ids]
+
+    def values(self) -> Iterator[List[str]]:
+        for _, words in self.items():
+            yield words
+
+    def get(self, key: str, default: Optional[List[str]] = None) -> Optional[List[str]]:
+        try:
+            return self[key]
+        except KeyError:
+            return default
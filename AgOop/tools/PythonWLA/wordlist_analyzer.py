@@ -5,153 +5,478 @@ This script analyzes and filters wordlists to create optimal game content.
 """
 
 import os
+import argparse
 import csv
+import hashlib
+import json
+import threading
+import time
 import requests
+import requests.adapters
 from collections import Counter, defaultdict
-from typing import List, Dict, Set, Tuple
+from typing import Callable, List, Dict, Iterable, Iterator, Mapping, NamedTuple, Optional, Set, Tuple
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+
+from frequency_cache import open_frequency_cache
+from external_groups import DEFAULT_MEMORY_BUDGET, Progress, external_groups
+from word_pipeline import Entry, GroupSizes, LengthCounts, Pairs, consume, normalize, read_lines, skip_comments, tap, validate
+from word_store import WordStore
+
+class FrequencySource(NamedTuple):
+    """Where the word frequency list of a locale comes from, and the cache file it is kept in."""
+    url: str
+    cache_file: str
+    # sha256 of the list as served, checked after download when set. None of the default sources
+    # pins one (the upstream lists are not versioned): their downloads are only checked for
+    # length and format, and the sha256 received is recorded next to the cache (.meta.json)
+    sha256: Optional[str] = None
+
+
+FREQUENCY_LISTS_URL = "https://raw.githubusercontent.com/hermitdave/FrequencyWords/master/content/2018"
+
 
 class WordFrequencyLoader:
     """Handles loading and managing word frequency data."""
     
-    FREQUENCY_URL = "https://raw.githubusercontent.com/hermitdave/FrequencyWords/master/content/2018/fr/fr_50k.txt"
+    FREQUENCY_URL = f"{FREQUENCY_LISTS_URL}/fr/fr_50k.txt"
     CACHE_FILE = "french_frequency.txt"
+    DOWNLOAD_CHUNK_SIZE = 1 << 16
+    DOWNLOAD_TIMEOUT = 30
+
+    # Frequency list of each locale, locales without one of their own use the French list
+    FREQUENCY_SOURCES: Dict[str, FrequencySource] = {
+        'en-GB': FrequencySource(f"{FREQUENCY_LISTS_URL}/en/en_50k.txt", "english_frequency.txt"),
+        'fr-FR': FrequencySource(FREQUENCY_URL, CACHE_FILE),
+        'fr-FR-': FrequencySource(FREQUENCY_URL, CACHE_FILE),
+        'it': FrequencySource(f"{FREQUENCY_LISTS_URL}/it/it_50k.txt", "italian_frequency.txt"),
+        'pt-BR': FrequencySource(f"{FREQUENCY_LISTS_URL}/pt_br/pt_br_50k.txt", "portuguese_frequency.txt"),
+    }
+    DEFAULT_LOCALE = 'fr-FR'
     
     @classmethod
-    def load_frequency_data(cls, cache_dir: str) -> Dict[str, float]:
-        """Load word frequency data, downloading if necessary."""
-        cache_path = os.path.join(cache_dir, cls.CACHE_FILE)
+    def source(cls, locale: Optional[str] = None) -> FrequencySource:
+        return cls.FREQUENCY_SOURCES.get(locale or cls.DEFAULT_LOCALE, cls.FREQUENCY_SOURCES[cls.DEFAULT_LOCALE])
+
+    @classmethod
+    def load_frequency_data(cls, cache_dir: str, locale: Optional[str] = None) -> Mapping[str, float]:
+        """Load word frequency data of the locale, downloading if necessary."""
+        source = cls.source(locale)
+        cache_path = os.path.join(cache_dir, source.cache_file)
         
         # Try to load from cache first
         if os.path.exists(cache_path):
             return cls._load_from_cache(cache_path)
             
         # Download and cache if not available
-        return cls._download_and_cache(cache_path)
+        return cls._download_and_cache(cache_path, source)
     
     @classmethod
-    def _load_from_cache(cls, cache_path: str) -> Dict[str, float]:
-        """Load frequency data from cache file."""
-        frequencies = {}
-        with open(cache_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip():
-                    word, freq = line.strip().split(' ')
-                    frequencies[word] = float(freq)
-        return frequencies
+    def _load_from_cache(cls, cache_path: str) -> Mapping[str, float]:
+        """Open the compiled, memory mapped cache of the frequency file (compiled again if the file changed)."""
+        return open_frequency_cache(cache_path)
     
     @classmethod
-    def _download_and_cache(cls, cache_path: str) -> Dict[str, float]:
+    def _download_and_cache(cls, cache_path: str, source: FrequencySource) -> Mapping[str, float]:
         """Download frequency data and save to cache."""
         try:
-            response = requests.get(cls.FREQUENCY_URL)
-            response.raise_for_status()
-            
-            frequencies = {}
-            for line in response.text.splitlines():
-                if line.strip():
-                    word, freq = line.strip().split(' ')
-                    frequencies[word] = float(freq)
-            
-            # Save to cache
-            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                for word, freq in frequencies.items():
-                    f.write(f"{word} {freq}\n")
-                    
-            return frequencies
-            
+            cls.download(source.url, cache_path, source.sha256)
         except Exception as e:
             print(f"Warning: Could not download frequency data: {e}")
             return {}
+        return cls._load_from_cache(cache_path)
+
+    @classmethod
+    def fetch_all(cls, cache_dir: str, locales: Optional[List[str]] = None,
+                  workers: Optional[int] = None) -> Dict[str, str]:
+        """Download or revalidate the frequency lists of the locales (default: all), concurrently.
+
+        All requests go through one pooled session. A list already cached is only asked for again
+        if it changed (If-None-Match / If-Modified-Since), so an unchanged one costs a single
+        round trip answered by 304 Not Modified.
+
+        Returns:
+            locale -> 'downloaded', 'not modified' or 'failed: <reason>'
+        """
+        locales = locales or list(cls.FREQUENCY_SOURCES)
+        # Locales sharing a list fetch it once
+        by_cache_file: Dict[str, List[str]] = defaultdict(list)
+        for locale in locales:
+            by_cache_file[cls.source(locale).cache_file].append(locale)
+
+        workers = workers or len(by_cache_file)
+        results: Dict[str, str] = {}
+        with requests.Session() as session:
+            adapter = requests.adapters.HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(cls._fetch, session, cls.source(same[0]), cache_dir): same
+                           for same in by_cache_file.values()}
+                for future, same in futures.items():
+                    try:
+                        status = future.result()
+                    except Exception as e:
+                        status = f"failed: {e}"
+                    results.update((locale, status) for locale in same)
+        return results
+
+    @classmethod
+    def _fetch(cls, session: requests.Session, source: FrequencySource, cache_dir: str) -> str:
+        """Conditional download of one list, using the validators saved with its cache."""
+        cache_path = os.path.join(cache_dir, source.cache_file)
+        validators = cls._read_validators(cache_path) if os.path.exists(cache_path) else {}
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+
+        validators = cls.download(source.url, cache_path, source.sha256, session=session, headers=headers)
+        if validators is None:
+            return 'not modified'
+        cls._write_validators(cache_path, validators)
+        return 'downloaded'
+
+    @staticmethod
+    def _read_validators(cache_path: str) -> Dict[str, str]:
+        try:
+            with open(cache_path + '.meta.json', 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _write_validators(cache_path: str, validators: Dict[str, str]) -> None:
+        tmp_path = f"{cache_path}.meta.json.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(validators, f, indent=2)
+        os.replace(tmp_path, cache_path + '.meta.json')
+
+    @classmethod
+    def download(cls, url: str, cache_path: str, expected_sha256: Optional[str] = None,
+                 session: Optional[requests.Session] = None,
+                 headers: Optional[Dict[str, str]] = None) -> Optional[Dict[str, str]]:
+        """Stream a frequency list to cache_path, a chunk at a time.
+
+        The lines are checked and written to a temporary file as they arrive, which replaces
+        cache_path only once the whole body is in and matches its Content-Length (and
+        expected_sha256, when one is given): an interrupted download never leaves a truncated
+        cache behind. Without expected_sha256 the content itself is not verified.
+
+        Returns:
+            None if the server answered 304 Not Modified (to conditional headers), otherwise the
+            sha256 of the body and the validators (etag, last_modified) of the response
+        """
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        digest = hashlib.sha256()
+        received = 0
+        try:
+            with (session or requests).get(url, headers=headers, stream=True, timeout=cls.DOWNLOAD_TIMEOUT) as response:
+                if response.status_code == 304:
+                    return None
+                response.raise_for_status()
+                # The length of an encoded (compressed) body is not the length of what iter_content yields
+                expected_length = None if response.headers.get('Content-Encoding') else response.headers.get('Content-Length')
+                with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+                    pending = b''
+                    for chunk in response.iter_content(cls.DOWNLOAD_CHUNK_SIZE):
+                        digest.update(chunk)
+                        received += len(chunk)
+                        lines = (pending + chunk).split(b'\n')
+                        pending = lines.pop()
+                        cls._write_lines(f, lines)
+                    cls._write_lines(f, [pending])
+                    f.flush()
+                    os.fsync(f.fileno())
+
+            if expected_length is not None and received != int(expected_length):
+                raise IOError(f"truncated download: {received} of {expected_length} bytes")
+            if expected_sha256 and digest.hexdigest() != expected_sha256.lower():
+                raise ValueError(f"checksum mismatch: got sha256 {digest.hexdigest()}, expected {expected_sha256}")
+            os.replace(tmp_path, cache_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return {
+            'sha256': digest.hexdigest(),
+            'etag': response.headers.get('ETag', ''),
+            'last_modified': response.headers.get('Last-Modified', ''),
+        }
+
+    @staticmethod
+    def _write_lines(f, lines: List[bytes]) -> None:
+        """Write the 'word frequency' lines of a chunk, a malformed line fails the download."""
+        for line in lines:
+            line = line.strip()
+            if line:
+                word, freq = line.decode('utf-8').split(' ')
+                f.write(f"{word} {float(freq)}\n")
+
+def _sub_anagram_counts(letter_counts: np.ndarray, word_lengths: np.ndarray, order: Optional[np.ndarray],
+                        sorted_masks: Optional[np.ndarray], root_counts: np.ndarray, lengths: int) -> np.ndarray:
+    """(roots, lengths) array: [i, n] = words of n letters that can be made from the letters of root i.
+
+    A root of 7 letters has at most 2^7 subsets of distinct letters, so rather than testing every
+    word, the words are sorted by letter mask (order, sorted_masks) and each subset mask of the root
+    picks its slice of candidates (searchsorted). Their letter counts are then compared to the root's
+    with broadcasted operations. Without masks (alphabet too large) every word is compared.
+    """
+    if sorted_masks is None:
+        fits = (letter_counts[None, :, :] <= root_counts[:, None, :]).all(axis=2)
+        root_index, word_index = np.nonzero(fits)
+        return np.bincount(root_index * lengths + word_lengths[word_index],
+                           minlength=len(root_counts) * lengths).reshape(-1, lengths)
+
+    present = root_counts > 0
+    distinct = present.sum(axis=1)
+    width = int(distinct.max(initial=0))
+    # Bit of each distinct letter of the root, packed first (then zeros), and the 2^width subsets of them
+    columns = np.argsort(~present, axis=1, kind='stable')[:, :width]
+    letter_bits = np.where(np.take_along_axis(present, columns, axis=1),
+                           np.ones(1, dtype=sorted_masks.dtype) << columns.astype(sorted_masks.dtype), 0)
+    subsets = np.arange(1 << width)
+    selector = ((subsets[:, None] >> np.arange(width)) & 1).astype(sorted_masks.dtype)
+
+    # (roots, subsets) masks; subsets using a padding bit repeat another one and are left out
+    sub_masks = letter_bits @ selector.T
+    valid = subsets[None, :] < (1 << distinct)[:, None]
+    low = np.searchsorted(sorted_masks, sub_masks, side='left')
+    high = np.searchsorted(sorted_masks, sub_masks, side='right')
+    sizes = np.where(valid, high - low, 0).ravel()
+
+    # One (root, candidate word) pair per word of a matching mask
+    root_index = np.repeat(np.arange(len(root_counts)).repeat(len(subsets)), sizes)
+    firsts = np.repeat(low.ravel(), sizes)
+    offsets = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    word_index = order[firsts + offsets]
+
+    # ... that has no more of each letter than the root
+    fits = (letter_counts[word_index] <= root_counts[root_index]).all(axis=1)
+    root_index, word_index = root_index[fits], word_index[fits]
+    return np.bincount(root_index * lengths + word_lengths[word_index],
+                       minlength=len(root_counts) * lengths).reshape(-1, lengths)
+
+
+# Arrays of the analyzer attached by each scoring worker process, by name
+_shared_arrays: Dict[str, np.ndarray] = {}
+_shared_blocks: List[shared_memory.SharedMemory] = []
+
+
+def _attach_shared_arrays(specs: Dict[str, Tuple[str, Tuple[int, ...], str]]) -> None:
+    """Worker initializer: map the shared memory blocks as arrays, nothing is copied."""
+    for name, (block_name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=block_name, track=False)
+        _shared_blocks.append(block)
+        _shared_arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _score_shared_range(start: int, stop: int, chunk_size: int) -> int:
+    """Worker task: score roots[start:stop] into the shared scores array. Returns the number of roots."""
+    a = _shared_arrays
+    lengths = a['scores'].shape[1]
+    for chunk_start in range(start, stop, chunk_size):
+        chunk = slice(chunk_start, min(chunk_start + chunk_size, stop))
+        a['scores'][chunk] = _sub_anagram_counts(a['letter_counts'], a['word_lengths'], a.get('order'),
+                                                 a.get('sorted_masks'), a['root_counts'][chunk], lengths)
+    return stop - start
+
+
+class _CharTable(dict):
+    """str.translate table filled on demand: a character is worked out the first time it is met."""
+
+    def __init__(self, convert):
+        super().__init__()
+        self._convert = convert
+
+    def __missing__(self, code: int) -> str:
+        value = self[code] = self._convert(chr(code))
+        return value
+
+
+class WordNormalizer:
+    """Accent folding, validation and anagram keys of the words of a locale.
+
+    unicodedata is only used once per character of the locale, to fill str.translate tables;
+    a word is then folded in one C-level translate pass, and each word only once (memo).
+    """
+
+    # Appended to the translation of a character a game word cannot contain
+    REJECT = '￿'
+
+    def __init__(self):
+        self._fold_table = _CharTable(self._fold_char)
+        self._key_table = _CharTable(self._key_char)
+        self._folded: Dict[str, str] = {}
+        # word -> (anagram key, only letters and '-' once stripped, length once stripped and lowercased)
+        self._keys: Dict[str, Tuple[str, bool, int]] = {}
+
+    @staticmethod
+    def _fold_char(c: str) -> str:
+        return ''.join(d for d in unicodedata.normalize('NFD', c) if unicodedata.category(d) != 'Mn')
+
+    def _key_char(self, c: str) -> str:
+        key = self._fold_char(c).lower()
+        if all(d.isalpha() or d == '-' for d in c.lower()):
+            return key
+        return key + self.REJECT
+
+    def clear(self):
+        """Forget the memoised words (the character tables are kept)."""
+        self._folded.clear()
+        self._keys.clear()
+
+    def fold(self, word: str, remember: bool = True) -> str:
+        """The word without accents, base letters and case kept.
+
+        remember=False does not add the word to the memo (words folded once).
+        """
+        folded = self._folded.get(word)
+        if folded is None:
+            folded = word.translate(self._fold_table)
+            if remember:
+                self._folded[word] = folded
+        return folded
+
+    def normalize(self, word: str, remember: bool = True) -> Tuple[str, bool, int]:
+        """(anagram key, made of letters and '-' only, length) of the word, validity and length once stripped.
+
+        remember=False does not add the word to the memo (words streamed once).
+        """
+        entry = self._keys.get(word)
+        if entry is None:
+            chars = word.translate(self._key_table)
+            stripped = word.strip()
+            valid_chars = chars if stripped == word else stripped.translate(self._key_table)
+            if self.REJECT in chars:
+                chars = chars.replace(self.REJECT, '')
+            entry = (''.join(sorted(chars)), self.REJECT not in valid_chars, len(stripped.lower()))
+            if remember:
+                self._keys[word] = entry
+        return entry
+
+
+# Bump when the snapshot content changes, so older snapshots are rebuilt
+SNAPSHOT_VERSION = 1
+# Snapshot key entries of the word sources: a snapshot that differs only by them can be updated in place
+SOURCE_KEYS = ('wordlist', 'supplementary_words')
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 
 class WordlistAnalyzer:
-    def __init__(self, input_file: str):
-        """Initialize the analyzer with input file path."""
+    # Words (or groups) decoded at once by build_frequency_column and build_letter_counts
+    BLOCK_SIZE = 8192
+
+    def __init__(self, input_file: str, load_frequencies: bool = True):
+        """Initialize the analyzer with input file path.
+
+        Args:
+            load_frequencies: False to leave the frequency list alone (nor opened, nor downloaded),
+                when only the words and groups are needed, e.g. to score roots: frequencies are then all 0
+        """
         self.input_file = input_file
-        self.words = set()
+        # Words in one compact store, their IDs ordered by anagram key: each group is an ID range
+        self.words = WordStore(())
         self.word_lengths: Dict[int, int] = defaultdict(int)
-        self.anagram_groups: Dict[str, Set[str]] = defaultdict(set)
-        self.word_frequencies: Dict[str, float] = {}
+        self.anagram_groups: Mapping[str, List[str]] = self.words.groups
+        self.word_frequencies: Mapping[str, float] = {}
         self.min_word_length = 4
         self.max_word_length = 7
+
+        # Letter count matrix, built by load_words: one row per word ID of word_index (the store),
+        # one uint8 column per letter of the locale alphabet (accent-folded, as in anagram keys)
+        self.word_index: WordStore = self.words
+        self.alphabet: str = ''
+        self.letter_counts: np.ndarray = np.zeros((0, 0), dtype=np.uint8)
+        self.letter_masks: Optional[np.ndarray] = None
+        # Resolved frequency of each word ID
+        self.frequencies: np.ndarray = np.zeros(0, dtype=np.float64)
+
+        # Accent folding and anagram keys of this locale's words
+        self.normalizer = WordNormalizer()
         
         # Load frequency data
-        cache_dir = os.path.dirname(os.path.abspath(__file__))
-        self.word_frequencies = WordFrequencyLoader.load_frequency_data(cache_dir)
+        self.cache_dir = os.path.dirname(os.path.abspath(__file__))
+        self.locale = os.path.basename(os.path.dirname(os.path.abspath(input_file)))
+        self.frequency_file = os.path.join(self.cache_dir, WordFrequencyLoader.source(self.locale).cache_file)
+        self.load_frequencies = load_frequencies
+        if load_frequencies:
+            self.word_frequencies = WordFrequencyLoader.load_frequency_data(self.cache_dir, self.locale)
+
+    def reload_frequencies(self) -> bool:
+        """Open the frequency list again if it changed since it was loaded: the mapped cache keeps
+        the data it was opened with. True if it was reloaded (the frequency column is then out of date)."""
+        if not self.load_frequencies or not os.path.exists(self.frequency_file):
+            return False
+        is_stale = getattr(self.word_frequencies, 'is_stale', None)
+        if is_stale is not None and not is_stale(self.frequency_file):
+            return False
+        previous, self.word_frequencies = self.word_frequencies, {}
+        # Closed first: the cache may be compiled again and replaced, which fails on a mapped file on Windows
+        if hasattr(previous, 'close'):
+            previous.close()
+        try:
+            self.word_frequencies = WordFrequencyLoader.load_frequency_data(self.cache_dir, self.locale)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not reload frequency data: {e}")
+        return True
 
     def remove_accents(self, word: str) -> str:
         """Remove accents from characters while keeping the base letter."""
-        return ''.join(c for c in unicodedata.normalize('NFD', word)
-                      if unicodedata.category(c) != 'Mn')
+        return self.normalizer.fold(word)
 
     def is_valid_word(self, word: str) -> bool:
-        """Check if a word is valid for the game."""
-        # Remove whitespace and convert to lowercase
-        word = word.strip().lower()
-        
-        # Length check
-        if not (self.min_word_length <= len(word) <= self.max_word_length):
-            return False
-            
-        # Only allow letters
-        if not all(c.isalpha() or c == '-' for c in word):
-            return False
-            
-        return True
+        """Check if a word is valid for the game: length once stripped, letters (or '-') only."""
+        _, letters_only, length = self.normalizer.normalize(word)
+        return letters_only and self.min_word_length <= length <= self.max_word_length
 
     def get_word_frequency(self, word: str) -> float:
         """Get the frequency score for a word."""
         # Try exact match first
-        if word in self.word_frequencies:
-            return self.word_frequencies[word]
+        frequency = self.word_frequencies.get(word)
+        if frequency is not None:
+            return frequency
         
         # Try without accents
-        normalized = self.remove_accents(word)
-        if normalized in self.word_frequencies:
-            return self.word_frequencies[normalized]
+        frequency = self.word_frequencies.get(self.remove_accents(word))
+        if frequency is not None:
+            return frequency
             
         return 0.0
 
     def get_anagram_key(self, word: str) -> str:
-        """Get sorted characters of word (anagram key)."""
-        # Remove accents for anagram grouping
-        word = self.remove_accents(word)
-        return ''.join(sorted(word.lower()))
+        """Get sorted characters of word (anagram key), accents removed and lowercased."""
+        return self.normalizer.normalize(word)[0]
+
+    def word_sources(self) -> List[str]:
+        """The files the words are read from: the wordlist, then the supplementary words if any."""
+        supp_file = os.path.join(os.path.dirname(self.input_file), 'supplementary_words.txt')
+        return [self.input_file] + ([supp_file] if os.path.exists(supp_file) else [])
+
+    def entries(self, sources: Optional[List[str]] = None) -> Iterator[Entry]:
+        """The valid words of the sources (default: word_sources) and their anagram keys, streamed."""
+        for source in sources or self.word_sources():
+            lines = skip_comments(read_lines(source))
+            yield from validate(normalize(lines, self.normalizer), self.min_word_length, self.max_word_length)
 
     def load_words(self):
-        """Load and process words from input file and supplementary words."""
+        """Load and process words from input file and supplementary words, in one streaming pass."""
+        word_lengths = LengthCounts()
+        pairs = Pairs()
         try:
-            # Load main wordlist
-            with open(self.input_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    word = line.strip()
-                    if self.is_valid_word(word):
-                        self.words.add(word)
-                        self.word_lengths[len(word)] += 1
-                        
-                        # Group by anagram key
-                        key = self.get_anagram_key(word)
-                        self.anagram_groups[key].add(word)
-
-            # Load supplementary words
-            supp_file = os.path.join(os.path.dirname(self.input_file), 'supplementary_words.txt')
-            if os.path.exists(supp_file):
-                with open(supp_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        # Skip comments and empty lines
-                        line = line.strip()
-                        if not line or line.startswith('//'):
-                            continue
-                        
-                        word = line.strip()
-                        if self.is_valid_word(word):
-                            self.words.add(word)
-                            self.word_lengths[len(word)] += 1
-                            
-                            # Group by anagram key
-                            key = self.get_anagram_key(word)
-                            self.anagram_groups[key].add(word)
+            sources = self.word_sources()
+            consume(self.entries(sources), word_lengths, pairs)
+            if len(sources) > 1:
                 print("Supplementary words loaded successfully")
                             
         except FileNotFoundError:
@@ -161,6 +486,308 @@ class WordlistAnalyzer:
             print(f"Error loading words: {e}")
             return
 
+        self.word_lengths.update(word_lengths)
+        # Sorted in place and streamed into the store: the pairs are never copied
+        pairs.sort()
+        self.words = self.word_index = WordStore(pairs, presorted=True)
+        pairs.clear()
+        self.anagram_groups = self.words.groups
+        self.build_letter_counts()
+        self.build_frequency_column()
+
+    def snapshot_key(self) -> Dict[str, str]:
+        """What the built state depends on: content hashes of the inputs, and the settings.
+
+        The frequencies are those this analyzer loaded (the digest of the mapped cache), not the
+        file on disk, which may have changed since.
+        """
+        key = {'version': str(SNAPSHOT_VERSION),
+               'min_word_length': str(self.min_word_length),
+               'max_word_length': str(self.max_word_length)}
+        inputs = self.word_sources()
+        # No supplementary words is part of the key too
+        inputs += [''] * (2 - len(inputs))
+        for name, path in zip(SOURCE_KEYS, inputs):
+            key[name] = _file_sha256(path) if path and os.path.exists(path) else ''
+        digest = getattr(self.word_frequencies, 'digest', None)
+        key['frequencies'] = digest() if digest else ''
+        return key
+
+    def snapshot_path(self, snapshot_dir: str) -> str:
+        return os.path.join(snapshot_dir, f"{self.locale}.snapshot.npz")
+
+    def save_snapshot(self, snapshot_path: str, key: Optional[Dict[str, str]] = None):
+        """Write the built state (word store, lengths, letter counts, frequencies) with its key."""
+        arrays = {f'store_{name}': array for name, array in self.words.to_arrays().items()}
+        arrays['letter_counts'] = self.letter_counts
+        if self.letter_masks is not None:
+            arrays['letter_masks'] = self.letter_masks
+        arrays['frequencies'] = self.frequencies
+        arrays['word_lengths'] = np.array(sorted(self.word_lengths.items()), dtype=np.int64).reshape(-1, 2)
+        meta = {'key': key or self.snapshot_key(), 'alphabet': self.alphabet}
+        arrays['meta'] = np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8)
+
+        os.makedirs(os.path.dirname(snapshot_path) or '.', exist_ok=True)
+        tmp_path = f"{snapshot_path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, snapshot_path)
+
+    def _save_snapshot_if_current(self, snapshot_path: str, key: Dict[str, str]) -> bool:
+        """save_snapshot, unless the inputs changed while they were read (the key would not describe
+        the state). True if it was saved."""
+        if self.snapshot_key() != key:
+            print(f"{self.locale}: the word lists changed while they were read, snapshot not saved")
+            return False
+        self.save_snapshot(snapshot_path, key)
+        return True
+
+    def load_snapshot(self, snapshot_path: str, key: Optional[Dict[str, str]] = None,
+                      ignore: Iterable[str] = ()) -> bool:
+        """Restore the built state from a snapshot, if it exists and was built from the same inputs.
+
+        Args:
+            ignore: snapshot key entries that may differ (e.g. SOURCE_KEYS, to update it afterwards)
+        """
+        key = key or self.snapshot_key()
+        try:
+            with np.load(snapshot_path) as snapshot:
+                meta = json.loads(snapshot['meta'].tobytes().decode('utf-8'))
+                saved_key = meta.get('key') or {}
+                if {n: v for n, v in saved_key.items() if n not in ignore} != {n: v for n, v in key.items() if n not in ignore}:
+                    return False
+                arrays = {name: snapshot[name] for name in snapshot.files}
+        except (OSError, ValueError, KeyError):
+            return False
+
+        self.words = self.word_index = WordStore.from_arrays(
+            {name[len('store_'):]: array for name, array in arrays.items() if name.startswith('store_')})
+        self.anagram_groups = self.words.groups
+        self.word_lengths = defaultdict(int, {int(length): int(count) for length, count in arrays['word_lengths']})
+        self.alphabet = meta['alphabet']
+        self.letter_counts = arrays['letter_counts']
+        self.letter_masks = arrays.get('letter_masks')
+        self.frequencies = arrays['frequencies']
+        return True
+
+    def load_words_cached(self, snapshot_dir: str) -> bool:
+        """load_words, or its snapshot if the inputs did not change. Returns True if the snapshot was used."""
+        self.reload_frequencies()
+        snapshot_path = self.snapshot_path(snapshot_dir)
+        key = self.snapshot_key()
+        if self.load_snapshot(snapshot_path, key):
+            return True
+        self.load_words()
+        if len(self.words):
+            self._save_snapshot_if_current(snapshot_path, key)
+        return False
+
+    def load_words_incremental(self, snapshot_dir: str) -> Optional[Tuple[int, int]]:
+        """load_words_cached, bringing an out of date snapshot up to date instead of starting over.
+
+        The words of the edited sources are diffed against those of the snapshot: only the words
+        added or removed go through the store (see apply_changes), the others are carried over.
+        A snapshot built with other settings or frequencies is not updated but rebuilt: the
+        frequency list is opened again first if it changed (see reload_frequencies).
+
+        Returns:
+            (words added, words removed), None if the words were all loaded again
+        """
+        self.reload_frequencies()
+        snapshot_path = self.snapshot_path(snapshot_dir)
+        key = self.snapshot_key()
+        if self.load_snapshot(snapshot_path, key):
+            return 0, 0
+        if not self.load_snapshot(snapshot_path, key, ignore=SOURCE_KEYS):
+            self.load_words()
+            if len(self.words):
+                self._save_snapshot_if_current(snapshot_path, key)
+            return None
+
+        # The same line always gives the same entry: only the lines not in the store are normalized
+        try:
+            lines = Counter(line for source in self.word_sources() for line in skip_comments(read_lines(source)))
+        except FileNotFoundError:
+            print(f"Error: Could not find file {self.input_file}")
+            return 0, 0
+        previous = {self.words[i]: key for key, ids in self.words.iter_groups() for i in ids}
+        added = set(validate(normalize((line for line in lines if line not in previous), self.normalizer),
+                             self.min_word_length, self.max_word_length))
+        removed = {(key, word) for word, key in previous.items() if word not in lines}
+        self.apply_changes(((entry.key, entry.word) for entry in added), removed)
+
+        # Valid lines of each length, duplicates counted (as load_words)
+        added_words = {entry.word for entry in added}
+        word_lengths: Dict[int, int] = defaultdict(int)
+        for line, count in lines.items():
+            if line in previous or line in added_words:
+                word_lengths[len(line)] += count
+        self.word_lengths = word_lengths
+        self._save_snapshot_if_current(snapshot_path, key)
+        return len(added), len(removed)
+
+    def apply_changes(self, added: Iterable[Tuple[str, str]], removed: Iterable[Tuple[str, str]]):
+        """Add and remove (anagram key, word) pairs: only the groups of their keys are rebuilt, and
+        only the words added get their frequency and letter counts computed."""
+        words, source = self.words.updated(added, removed)
+        kept = source >= 0
+        new_ids = np.flatnonzero(~kept)
+
+        frequencies = np.zeros(len(words), dtype=np.float64)
+        frequencies[kept] = self.frequencies[source[kept]]
+        frequencies[new_ids] = self._resolve_frequencies([words[i] for i in new_ids])
+
+        self.words = self.word_index = words
+        self.anagram_groups = words.groups
+        self.frequencies = frequencies
+        if words.key_letters() != self.alphabet:
+            # A letter appeared or disappeared: the columns change
+            self.build_letter_counts()
+            return
+        counts = np.zeros((len(words), len(self.alphabet)), dtype=np.uint8)
+        counts[kept] = self.letter_counts[source[kept]]
+        groups = np.searchsorted(words.group_starts, new_ids, side='right') - 1
+        counts[new_ids] = self._count_letters([words.group_key(g) for g in groups])
+        self.letter_counts = counts
+        self.letter_masks = self._letter_masks(counts)
+
+    def build_letter_counts(self):
+        """Build the word x letter count matrix used to score roots in bulk."""
+        self.alphabet = self.words.key_letters()
+        # Word IDs are in anagram key order: the rows of a group are its key's counts, repeated
+        group_counts = np.zeros((self.words.group_count, len(self.alphabet)), dtype=np.uint8)
+        for start in range(0, self.words.group_count, self.BLOCK_SIZE):
+            stop = min(start + self.BLOCK_SIZE, self.words.group_count)
+            group_counts[start:stop] = self._count_letters([self.words.group_key(g) for g in range(start, stop)])
+        self.letter_counts = np.repeat(group_counts, np.diff(self.words.group_starts.astype(np.int64)), axis=0)
+        # Which letters each word uses, as bits: a first cheap filter before comparing counts
+        self.letter_masks = self._letter_masks(self.letter_counts)
+
+    def build_frequency_column(self):
+        """Resolve the frequency of every word once (exact, then without accents), in word ID order.
+
+        Same values as get_word_frequency, the compiled cache resolves all the words in one merge pass.
+        """
+        self.frequencies = np.zeros(len(self.words), dtype=np.float64)
+        # By blocks of words, so that only a block of them is ever decoded at once
+        for start in range(0, len(self.words), self.BLOCK_SIZE):
+            stop = min(start + self.BLOCK_SIZE, len(self.words))
+            self.frequencies[start:stop] = self._resolve_frequencies([self.words[i] for i in range(start, stop)])
+
+    def _resolve_frequencies(self, words: List[str]) -> np.ndarray:
+        frequencies = self.word_frequencies
+        if not frequencies:
+            return np.zeros(len(words), dtype=np.float64)
+        lookup = getattr(frequencies, 'get_many', None) or (lambda words: [frequencies.get(w) for w in words])
+        resolved = lookup(words)
+        missing = [i for i, frequency in enumerate(resolved) if frequency is None]
+        # Each word is folded once here: not memoised
+        folded = [self.normalizer.fold(words[i], remember=False) for i in missing]
+        for i, frequency in zip(missing, lookup(folded)):
+            resolved[i] = frequency
+        return np.array([f or 0.0 for f in resolved], dtype=np.float64)
+
+    def frequency(self, word: str) -> float:
+        """Resolved frequency of a word of the list (0.0 for a word that is not in it)."""
+        word_id = self.words.id(word)
+        return float(self.frequencies[word_id]) if word_id >= 0 else 0.0
+
+    def _letter_masks(self, counts: np.ndarray) -> Optional[np.ndarray]:
+        """One bit per letter present, in the narrowest integer that fits the alphabet (None if none does)."""
+        if len(self.alphabet) > 64:
+            return None
+        dtype = np.uint32 if len(self.alphabet) <= 32 else np.uint64
+        bits = (np.ones(1, dtype=dtype) << np.arange(len(self.alphabet), dtype=dtype))
+        return np.bitwise_or.reduce(np.where(counts > 0, bits, dtype(0)), axis=1)
+
+    def _count_letters(self, keys: List[str]) -> np.ndarray:
+        """Letter count rows of anagram keys (letters outside the alphabet are dropped)."""
+        counts = np.zeros((len(keys), len(self.alphabet)), dtype=np.uint8)
+        # Every character of every key as a code point, and the key it belongs to
+        codes = np.frombuffer(''.join(keys).encode('utf-32-le'), dtype=np.uint32)
+        rows = np.repeat(np.arange(len(keys)), [len(key) for key in keys])
+        alphabet = np.frombuffer(self.alphabet.encode('utf-32-le'), dtype=np.uint32)
+        columns = np.minimum(np.searchsorted(alphabet, codes), max(len(alphabet) - 1, 0))
+        known = alphabet[columns] == codes if len(alphabet) else np.zeros(len(codes), dtype=bool)
+        np.add.at(counts, (rows[known], columns[known]), 1)
+        return counts
+
+    def _default_roots(self) -> List[str]:
+        """Every word of max_word_length letters."""
+        return [self.words[i] for i in np.flatnonzero(self.words.lengths == self.max_word_length)]
+
+    def _scoring_arrays(self, roots: List[str]) -> Dict[str, np.ndarray]:
+        """Arrays score_roots works from: the word matrix, the words sorted by mask and the root counts."""
+        arrays = {
+            'letter_counts': self.letter_counts,
+            'word_lengths': self.words.lengths.astype(np.intp),
+            'root_counts': self._count_letters([self.get_anagram_key(r) for r in roots]),
+        }
+        if self.letter_masks is not None:
+            arrays['order'] = np.argsort(self.letter_masks, kind='stable')
+            arrays['sorted_masks'] = self.letter_masks[arrays['order']]
+        return arrays
+
+    def score_roots(self, roots: Optional[List[str]] = None, chunk_size: int = 1024) -> Tuple[List[str], np.ndarray]:
+        """Count, for each root, the words of the list that can be made from its letters, by length.
+
+        Args:
+            roots: words to score, defaults to every word of max_word_length letters
+            chunk_size: roots handled at once
+
+        Returns:
+            the roots, and a (roots, max_word_length + 1) array: [i, n] = sub-anagrams of n letters of root i
+        """
+        if roots is None:
+            roots = self._default_roots()
+        a = self._scoring_arrays(roots)
+        lengths = self.max_word_length + 1
+        scores = np.zeros((len(roots), lengths), dtype=np.int64)
+        for start in range(0, len(roots), chunk_size):
+            chunk = slice(start, start + chunk_size)
+            scores[chunk] = _sub_anagram_counts(a['letter_counts'], a['word_lengths'], a.get('order'),
+                                                a.get('sorted_masks'), a['root_counts'][chunk], lengths)
+        return roots, scores
+
+    def score_roots_parallel(self, roots: Optional[List[str]] = None, workers: Optional[int] = None,
+                             chunk_size: int = 1024) -> Tuple[List[str], np.ndarray]:
+        """Same result as score_roots, with the roots spread over a pool of worker processes.
+
+        The word matrix, the root counts and the scores are placed in shared memory once; workers
+        only receive a root range and write their scores in place, the dictionary is never pickled.
+        """
+        if roots is None:
+            roots = self._default_roots()
+        arrays = self._scoring_arrays(roots)
+        arrays['scores'] = np.zeros((len(roots), self.max_word_length + 1), dtype=np.int64)
+        workers = workers or os.cpu_count() or 1
+
+        blocks: List[shared_memory.SharedMemory] = []
+        specs: Dict[str, Tuple[str, Tuple[int, ...], str]] = {}
+        try:
+            shared: Dict[str, np.ndarray] = {}
+            for name, array in arrays.items():
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                blocks.append(block)
+                shared[name] = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+                shared[name][...] = array
+                specs[name] = (block.name, array.shape, array.dtype.str)
+
+            # A few ranges per worker, so a slow range does not leave the others idle
+            step = max(1, min(chunk_size, -(-len(roots) // (workers * 4))))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach_shared_arrays,
+                                     initargs=(specs,)) as pool:
+                futures = [pool.submit(_score_shared_range, start, min(start + step, len(roots)), chunk_size)
+                           for start in range(0, len(roots), step)]
+                for future in futures:
+                    future.result()
+            scores = shared['scores'].copy()
+            del shared
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+        return roots, scores
+
     def analyze(self) -> Dict:
         """Analyze the wordlist and return statistics."""
         stats = {
@@ -171,103 +798,328 @@ class WordlistAnalyzer:
                 'distribution': defaultdict(int)
             },
             'frequency_stats': {
-                'words_with_frequency': len([w for w in self.words if self.get_word_frequency(w) > 0]),
-                'avg_frequency': sum(self.get_word_frequency(w) for w in self.words) / len(self.words) if self.words else 0
+                'words_with_frequency': int(np.count_nonzero(self.frequencies > 0)),
+                'avg_frequency': float(self.frequencies.mean()) if len(self.frequencies) else 0
             }
         }
         
         # Count anagram group sizes
-        for words in self.anagram_groups.values():
-            stats['anagram_groups']['distribution'][len(words)] += 1
+        for size, count in enumerate(np.bincount(np.diff(self.words.group_starts))):
+            if count:
+                stats['anagram_groups']['distribution'][size] += int(count)
             
         return stats
 
+    def stream_statistics(self) -> Dict:
+        """Word count, lengths and anagram group statistics of analyze(), in one pass over the files.
+
+        The words are not loaded: only the counters (and the distinct words, to count each once) are kept.
+        """
+        word_lengths, group_sizes = LengthCounts(), GroupSizes()
+        consume(self.entries(), word_lengths, group_sizes)
+        return {
+            'total_words': len(group_sizes.seen),
+            'word_lengths': dict(word_lengths),
+            'anagram_groups': {
+                'total': len(group_sizes.group_sizes),
+                'distribution': dict(group_sizes.distribution())
+            }
+        }
+
     def filter_words(self, min_anagrams: int = 2, min_frequency: float = 0.0) -> Set[str]:
         """Filter words based on minimum number of anagrams and frequency."""
-        filtered_words = set()
+        # Size of the anagram group of each word ID
+        group_sizes = np.diff(self.words.group_starts)
+        keep = np.repeat(group_sizes, group_sizes) >= min_anagrams
         
-        for key, words in self.anagram_groups.items():
-            if len(words) >= min_anagrams:
-                # Filter by frequency if specified
-                if min_frequency > 0:
-                    words = {w for w in words if self.get_word_frequency(w) >= min_frequency}
-                if words:  # Only add if we still have words after frequency filtering
-                    filtered_words.update(words)
+        # Filter by frequency if specified
+        if min_frequency > 0:
+            keep &= self.frequencies >= min_frequency
                 
-        return filtered_words
+        return {self.words[i] for i in np.flatnonzero(keep)}
 
     def create_difficulty_lists(self) -> Dict[str, Set[str]]:
         """Create difficulty-based wordlists."""
-        difficulty_lists = {
-            'beginner': set(),    # 4-5 letters, 2+ anagrams, high frequency
-            'intermediate': set(), # 5-6 letters, 3+ anagrams, medium frequency
-            'advanced': set()      # 6-7 letters, 4+ anagrams, any frequency
-        }
-        
         # Calculate frequency thresholds
-        frequencies = [self.get_word_frequency(w) for w in self.words]
-        frequencies = [f for f in frequencies if f > 0]  # Remove zeros
-        if frequencies:
-            median_freq = sorted(frequencies)[len(frequencies)//2]
+        frequencies = np.sort(self.frequencies[self.frequencies > 0])  # Remove zeros
+        if len(frequencies):
+            median_freq = float(frequencies[len(frequencies)//2])
             high_freq = median_freq * 2
             med_freq = median_freq / 2
         else:
             high_freq = med_freq = 0
         
-        for key, words in self.anagram_groups.items():
-            word_len = len(next(iter(words)))  # Length of first word in group
+        # Per word ID: length of the first word of its group, and number of anagrams in the group
+        starts = self.words.group_starts
+        group_sizes = np.diff(starts)
+        word_len = np.repeat(self.words.lengths[starts[:-1]], group_sizes)
+        num_anagrams = np.repeat(group_sizes, group_sizes)
+
+        # A group goes to the first level it qualifies for, then its words are filtered by frequency
+        beginner = (4 <= word_len) & (word_len <= 5) & (num_anagrams >= 2)           # high frequency
+        intermediate = ~beginner & (5 <= word_len) & (word_len <= 6) & (num_anagrams >= 3)  # medium frequency
+        advanced = ~beginner & ~intermediate & (6 <= word_len) & (word_len <= 7) & (num_anagrams >= 4)  # any frequency
+
+        difficulty_lists = {
+            'beginner': beginner & (self.frequencies >= high_freq),
+            'intermediate': intermediate & (self.frequencies >= med_freq),
+            'advanced': advanced,
+        }
+        return {level: {self.words[i] for i in np.flatnonzero(keep)} for level, keep in difficulty_lists.items()}
+
+    def external_groups(self, memory_budget: int = DEFAULT_MEMORY_BUDGET, progress: Progress = None,
+                        entries: Optional[Iterable[Entry]] = None) -> Iterator[Tuple[str, List[str]]]:
+        """Anagram groups of the word sources (or entries), in key order, sorted on disk instead of in memory.
+
+        For lists too large to load: see external_groups.external_groups, memory_budget is in bytes.
+        """
+        return external_groups(self.entries() if entries is None else entries, memory_budget, progress=progress)
+
+    def filter_groups(self, groups: Iterable[Tuple[str, List[str]]], min_anagrams: int = 2,
+                      min_frequency: float = 0.0) -> Iterator[str]:
+        """filter_words over streamed groups (e.g. external_groups), the words come as their group does."""
+        for key, words in groups:
+            if len(words) >= min_anagrams:
+                # Filter by frequency if specified
+                if min_frequency > 0:
+                    words = [w for w, f in zip(words, self._resolve_frequencies(words)) if f >= min_frequency]
+                yield from words
+
+    def create_difficulty_lists_from_groups(self, groups: Iterable[Tuple[str, List[str]]],
+                                            stats: Optional[Dict] = None) -> Dict[str, Set[str]]:
+        """create_difficulty_lists over streamed groups (e.g. external_groups), in one pass.
+
+        The frequency thresholds come from the median frequency of all the words, only known once
+        every group went by: until then the beginner and intermediate candidates are kept with their
+        frequency. Words without frequency data are dropped as soon as one word has some (the
+        thresholds are then above zero).
+
+        Args:
+            groups: (anagram key, distinct words sorted) of every group
+            stats: if given, filled with the total_words, anagram_groups and frequency_stats of analyze()
+        """
+        frequencies: List[float] = []
+        total_words = 0
+        distribution: Dict[int, int] = defaultdict(int)
+        candidates: Dict[str, List[Tuple[str, float]]] = {'beginner': [], 'intermediate': []}
+        advanced: Set[str] = set()
+
+        for key, words in groups:
+            word_frequencies = self._resolve_frequencies(words).tolist()
+            had_frequencies = bool(frequencies)
+            frequencies.extend(f for f in word_frequencies if f > 0)
+            if frequencies and not had_frequencies:
+                candidates = {level: [c for c in kept if c[1] > 0] for level, kept in candidates.items()}
+            total_words += len(words)
+            distribution[len(words)] += 1
+
+            word_len = len(words[0])  # Length of first word in group
             num_anagrams = len(words)
-            
-            # Filter words by frequency for each difficulty level
             if 4 <= word_len <= 5 and num_anagrams >= 2:
-                high_freq_words = {w for w in words if self.get_word_frequency(w) >= high_freq}
-                if high_freq_words:
-                    difficulty_lists['beginner'].update(high_freq_words)
+                level = 'beginner'
             elif 5 <= word_len <= 6 and num_anagrams >= 3:
-                med_freq_words = {w for w in words if self.get_word_frequency(w) >= med_freq}
-                if med_freq_words:
-                    difficulty_lists['intermediate'].update(med_freq_words)
-            elif 6 <= word_len <= 7 and num_anagrams >= 4:
-                difficulty_lists['advanced'].update(words)
-                
-        return difficulty_lists
+                level = 'intermediate'
+            else:
+                if 6 <= word_len <= 7 and num_anagrams >= 4:
+                    advanced.update(words)
+                continue
+            candidates[level].extend((w, f) for w, f in zip(words, word_frequencies) if f > 0 or not frequencies)
+
+        # Calculate frequency thresholds
+        if frequencies:
+            median_freq = sorted(frequencies)[len(frequencies)//2]
+            high_freq = median_freq * 2
+            med_freq = median_freq / 2
+        else:
+            high_freq = med_freq = 0
+
+        if stats is not None:
+            stats['total_words'] = total_words
+            stats['anagram_groups'] = {'total': sum(distribution.values()), 'distribution': distribution}
+            stats['frequency_stats'] = {
+                'words_with_frequency': len(frequencies),
+                'avg_frequency': sum(frequencies) / total_words if total_words else 0
+            }
+        return {
+            'beginner': {w for w, f in candidates['beginner'] if f >= high_freq},
+            'intermediate': {w for w, f in candidates['intermediate'] if f >= med_freq},
+            'advanced': advanced,
+        }
+
+    def save_filtered_lists(self, output_dir: str, memory_budget: Optional[int] = None,
+                            progress: Progress = None) -> List[str]:
+        """Save filtered wordlists to files, the files whose content did not change are left alone.
+
+        With a memory_budget (bytes), the words are not loaded: they are grouped on disk
+        (external_groups) and the lists and statistics come out of one pass over the groups.
+
+        Returns:
+            The files written
+        """
+        if memory_budget is None:
+            return self._write_filtered_lists(output_dir, self.create_difficulty_lists(), self.analyze(), self.frequency)
+
+        word_lengths = LengthCounts()
+        stats: Dict = {}
+        groups = self.external_groups(memory_budget, progress, entries=tap(self.entries(), word_lengths))
+        try:
+            difficulty_lists = self.create_difficulty_lists_from_groups(groups, stats)
+        except FileNotFoundError:
+            print(f"Error: Could not find file {self.input_file}")
+            return []
+        stats['word_lengths'] = dict(word_lengths)
+        # Only the words kept, resolved without memoising their folds (get_word_frequency would)
+        kept = sorted(set().union(*difficulty_lists.values()))
+        resolved = dict(zip(kept, self._resolve_frequencies(kept).tolist()))
+        return self._write_filtered_lists(output_dir, difficulty_lists, stats, resolved.__getitem__)
 
-    def save_filtered_lists(self, output_dir: str):
-        """Save filtered wordlists to files."""
+    def _write_filtered_lists(self, output_dir: str, difficulty_lists: Dict[str, Set[str]], stats: Dict,
+                              frequency: Callable[[str], float]) -> List[str]:
         os.makedirs(output_dir, exist_ok=True)
+        written = []
         
         # Save difficulty-based lists
-        difficulty_lists = self.create_difficulty_lists()
         for difficulty, words in difficulty_lists.items():
             output_file = os.path.join(output_dir, f'wordlist_{difficulty}.txt')
-            with open(output_file, 'w', encoding='utf-8') as f:
-                # Sort words by frequency, highest first
-                sorted_words = sorted(words, key=lambda w: (-self.get_word_frequency(w), w))
-                for word in sorted_words:
-                    f.write(f"{word} # freq: {self.get_word_frequency(word):.6f}\n")
+            # Sort words by frequency, highest first
+            sorted_words = sorted(words, key=lambda w: (-frequency(w), w))
+            lines = [f"{word} # freq: {frequency(word):.6f}\n" for word in sorted_words]
+            if _write_if_changed(output_file, ''.join(lines)):
+                written.append(output_file)
 
         # Save statistics
-        stats = self.analyze()
+        lines = ["Wordlist Statistics\n",
+                 "==================\n\n",
+                 f"Total words: {stats['total_words']}\n",
+                 f"Words with frequency data: {stats['frequency_stats']['words_with_frequency']}\n",
+                 f"Average word frequency: {stats['frequency_stats']['avg_frequency']:.6f}\n\n"]
+
+        lines.append("Word lengths distribution:\n")
+        for length, count in sorted(stats['word_lengths'].items()):
+            lines.append(f"{length} letters: {count} words\n")
+
+        lines.append("\nAnagram groups distribution:\n")
+        for size, count in sorted(stats['anagram_groups']['distribution'].items()):
+            lines.append(f"{size} anagrams: {count} groups\n")
         stats_file = os.path.join(output_dir, 'wordlist_stats.txt')
-        with open(stats_file, 'w', encoding='utf-8') as f:
-            f.write("Wordlist Statistics\n")
-            f.write("==================\n\n")
-            f.write(f"Total words: {stats['total_words']}\n")
-            f.write(f"Words with frequency data: {stats['frequency_stats']['words_with_frequency']}\n")
-            f.write(f"Average word frequency: {stats['frequency_stats']['avg_frequency']:.6f}\n\n")
-            
-            f.write("Word lengths distribution:\n")
-            for length, count in sorted(stats['word_lengths'].items()):
-                f.write(f"{length} letters: {count} words\n")
-            
-            f.write("\nAnagram groups distribution:\n")
-            for size, count in sorted(stats['anagram_groups']['distribution'].items()):
-                f.write(f"{size} anagrams: {count} groups\n")
+        if _write_if_changed(stats_file, ''.join(lines)):
+            written.append(stats_file)
+        return written
+
+    def update_filtered_lists(self, output_dir: str, snapshot_dir: str) -> List[str]:
+        """Bring the words up to date with their sources (load_words_incremental) and save the
+        filtered lists that changed. Returns the files written."""
+        changes = self.load_words_incremental(snapshot_dir)
+        written = self.save_filtered_lists(output_dir)
+        loaded = "all words loaded" if changes is None else f"{changes[0]} words added, {changes[1]} removed"
+        print(f"{self.locale}: {loaded}, {len(written)} files rewritten"
+              + ''.join(f"\n  {os.path.basename(path)}" for path in written))
+        return written
+
+    def _source_state(self) -> List[Tuple[str, int, int]]:
+        """(path, size, modification time) of the word sources and the frequency list."""
+        state = []
+        for path in self.word_sources() + [self.frequency_file]:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            state.append((path, stat.st_size, stat.st_mtime_ns))
+        return state
+
+    def watch(self, output_dir: str, snapshot_dir: str, interval: float = 1.0,
+              stop: Optional[threading.Event] = None):
+        """update_filtered_lists now, and again each time a word source is saved.
+
+        The sources are polled every interval seconds until stop is set: run it in a thread to
+        keep it in the background, or until Ctrl+C.
+        """
+        stop = stop or threading.Event()
+        seen = None
+        while True:
+            state = self._source_state()
+            if state != seen:
+                seen = state
+                self.update_filtered_lists(output_dir, snapshot_dir)
+            if stop.wait(interval):
+                return
+
+def _write_if_changed(path: str, text: str) -> bool:
+    """Write the text to the file unless it already holds exactly that. True if it was written."""
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            if f.read() == text:
+                return False
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+    return True
+
+def score_locales(locales_dir: str, locales: List[str], report_file: str, workers: Optional[int] = None) -> None:
+    """Score the roots of several locales in parallel and merge them into one CSV report.
+
+    One row per root: locale, root, total sub-anagrams and the count for each word length.
+    """
+    rows = []
+    max_length = 0
+    for locale in locales:
+        # Scoring only needs the words and their groups
+        analyzer = WordlistAnalyzer(os.path.join(locales_dir, locale, 'wordlist.txt'), load_frequencies=False)
+        analyzer.load_words()
+        start = time.perf_counter()
+        roots, scores = analyzer.score_roots_parallel(workers=workers)
+        elapsed = time.perf_counter() - start
+        max_length = max(max_length, scores.shape[1] - 1)
+        rows.extend((locale, root, row) for root, row in zip(roots, scores.tolist()))
+        print(f"{locale}: {len(roots)} roots scored against {len(analyzer.word_index)} words in {elapsed:.2f}s")
+
+    lengths = range(1, max_length + 1)
+    with open(report_file, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['locale', 'root', 'total'] + [f'{n}_letters' for n in lengths])
+        for locale, root, row in rows:
+            counts = [row[n] if n < len(row) else 0 for n in lengths]
+            writer.writerow([locale, root, sum(counts)] + counts)
+    print(f"Root scores of {len(locales)} locales written to {report_file}")
 
 def main():
     """Main function to run the analyzer."""
+    parser = argparse.ArgumentParser(description="Analyze and filter the Anagramarama wordlists.")
+    parser.add_argument('--score-roots', action='store_true',
+                        help="score the roots of every locale on all cores instead of filtering fr-FR")
+    parser.add_argument('--fetch-frequencies', action='store_true',
+                        help="download or revalidate the word frequency list of every locale, concurrently")
+    parser.add_argument('--locales', nargs='*', help="locales to score or fetch (default: all of them)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes, or download threads (default: all cores, one per list)")
+    parser.add_argument('--report', default='root_scores.csv', help="merged root scores report")
+    parser.add_argument('--no-snapshot', action='store_true',
+                        help="always load the words again, without reading or writing the snapshot")
+    parser.add_argument('--watch', action='store_true',
+                        help="keep running, and update the filtered lists each time a wordlist is saved")
+    parser.add_argument('--interval', type=float, default=1.0, metavar='SECONDS',
+                        help="how often --watch checks the wordlists")
+    parser.add_argument('--memory-budget', type=int, default=None, metavar='MB',
+                        help="group the words on disk within this memory budget instead of loading them")
+    args = parser.parse_args()
+
     # Get the directory of the current script
     current_dir = os.path.dirname(os.path.abspath(__file__))
+
+    if args.fetch_frequencies:
+        for locale, status in sorted(WordFrequencyLoader.fetch_all(current_dir, args.locales, args.workers).items()):
+            print(f"{locale}: {status}")
+        return
+
+    if args.score_roots:
+        locales_dir = os.path.join(current_dir, '..', '..', 'res', 'i18n')
+        locales = args.locales or sorted(l for l in os.listdir(locales_dir)
+                                         if os.path.exists(os.path.join(locales_dir, l, 'wordlist.txt')))
+        score_locales(locales_dir, locales, args.report, args.workers)
+        return
     
     # Navigate to the French wordlist
     input_file = os.path.join(current_dir, '..', 'i18n', 'fr-FR', 'wordlist.txt')
@@ -277,8 +1129,19 @@ def main():
     
     # Initialize and run analyzer
     analyzer = WordlistAnalyzer(input_file)
-    analyzer.load_words()
-    analyzer.save_filtered_lists(output_dir)
+    if args.memory_budget:
+        analyzer.save_filtered_lists(output_dir, args.memory_budget * 1024 * 1024, progress=print)
+    elif args.no_snapshot:
+        analyzer.load_words()
+        analyzer.save_filtered_lists(output_dir)
+    elif args.watch:
+        print(f"Watching {', '.join(analyzer.word_sources())} (Ctrl+C to stop)")
+        try:
+            analyzer.watch(output_dir, os.path.join(current_dir, 'snapshots'), args.interval)
+        except KeyboardInterrupt:
+            pass
+    else:
+        analyzer.update_filtered_lists(output_dir, os.path.join(current_dir, 'snapshots'))
     
     print(f"Filtered wordlists have been created in {output_dir}")
 
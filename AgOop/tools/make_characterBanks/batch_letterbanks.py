@@ -0,0 +1,115 @@
+""" Render the character banks of many fonts in parallel
+
+Every font x bank (letterBank, smallLetterBank, numberBank) is one job, spread over a
+process pool. A job is skipped when its output already exists and was produced from the same
+font file content and the same bank parameters (recorded in characterBank/manifest.json).
+
+Examples:
+    python batch_letterbanks.py                       # every .otf/.ttf in the current folder
+    python batch_letterbanks.py "fonts/*.ttf" ./Blue_Highway_Rg.otf --workers 4
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import make_letterbank
+from make_letterbank import generate_letterBank_image, large_letters_bank, small_letters_bank, numbers_bank
+
+# Bump when the rendering changes, so existing outputs are rendered again
+RENDER_VERSION = 1
+
+BANKS = {
+    "letterBank.png": large_letters_bank,
+    "smallLetterBank.png": small_letters_bank,
+    "numberBank.png": numbers_bank,
+}
+
+
+def file_hash(file_name: str) -> str:
+    with open(file_name, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def job_key(font_hash: str, bank_file: str) -> str:
+    """ Identifies what an output was rendered from: font content, bank parameters and render settings """
+    key = {
+        "version": RENDER_VERSION,
+        "font": font_hash,
+        "bank": vars(BANKS[bank_file]),
+        "fractional_font_sizes": make_letterbank.fractional_font_sizes,
+        "fractional_font_size_steps": make_letterbank.fractional_font_size_steps,
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def render_bank(font: str, bank_file: str, output_file: str) -> float:
+    """ Render one bank of one font, runs in a worker process. Returns the seconds it took """
+    start = time.perf_counter()
+    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+    temp_file = f"{output_file[:-4]}.{os.getpid()}.tmp.png"
+    generate_letterBank_image(font, BANKS[bank_file]).save(temp_file)
+    os.replace(temp_file, output_file)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render the character banks of many fonts in parallel.")
+    parser.add_argument("fonts", nargs="*", default=["*.otf", "*.ttf"], help="font files or glob patterns")
+    parser.add_argument("--output-dir", default="characterBank", help="one sub folder per font is created in it")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    fonts = sorted({font for pattern in args.fonts for font in (glob.glob(pattern) or [pattern]) if os.path.isfile(font)})
+    output_dir = Path(args.output_dir)
+    manifest_file = output_dir / "manifest.json"
+    manifest: dict[str, dict[str, str]] = {}
+    if manifest_file.exists():
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    # (font, bank file, output file, key) of the jobs to run, and the summary lines
+    jobs: list[tuple[str, str, str, str]] = []
+    summary: list[tuple[str, str, str, float]] = []
+    for font in fonts:
+        font_hash = file_hash(font)
+        for bank_file in BANKS:
+            output_file = str(output_dir / Path(font).stem / bank_file)
+            key = job_key(font_hash, bank_file)
+            entry = manifest.get(output_file)
+            if entry and entry["key"] == key and os.path.exists(output_file) and file_hash(output_file) == entry["output"]:
+                summary.append((font, bank_file, "skipped", 0.0))
+            else:
+                jobs.append((font, bank_file, output_file, key))
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(render_bank, font, bank_file, output_file): (font, bank_file, output_file, key)
+                   for font, bank_file, output_file, key in jobs}
+        for future in as_completed(futures):
+            font, bank_file, output_file, key = futures[future]
+            try:
+                seconds = future.result()
+            except Exception as e:
+                summary.append((font, bank_file, f"failed: {e}", 0.0))
+                continue
+            manifest[output_file] = {"key": key, "output": file_hash(output_file)}
+            summary.append((font, bank_file, "rendered", seconds))
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(manifest_file, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    print(f"\n{'font':<40} {'bank':<20} {'status':<10} {'seconds':>8}")
+    for font, bank_file, status, seconds in sorted(summary):
+        print(f"{Path(font).name:<40} {bank_file:<20} {status:<10} {seconds:>8.2f}")
+    rendered = sum(1 for line in summary if line[2] == "rendered")
+    print(f"{len(summary)} jobs, {rendered} rendered, {len(summary) - rendered} not rendered, {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+from PIL import ImageFont
+import hashlib
+import json
+import os
+from pathlib import Path
+
+
+class GlyphMetricsCache:
+    """ Cache of loaded fonts and of the glyph bounding boxes measured with them.
+
+    Loading a FreeTypeFont and measuring a glyph is what the letterbank generation spends
+    its time on, and the same (font, size, character, anchor) is asked for again and again:
+    once to find the font size, once more to position the glyphs, for each of the banks.
+    Each glyph is measured at most once per size, the metrics can also be kept on disk
+    between runs (they are keyed by the font file content, not its name).
+    """
+
+    def __init__(self, cache_file: str | Path | None = None):
+        """
+        Args:
+            cache_file (str | Path | None, optional): JSON file to load the metrics from and save them to.
+                Defaults to None, in memory only.
+        """
+        self.cache_file: Path | None = Path(cache_file) if cache_file else None
+        # (font file path, size) -> loaded font
+        self._fonts: dict[tuple[str, float], ImageFont.FreeTypeFont] = {}
+        # font file path -> (modification time, content hash)
+        self._hashes: dict[str, tuple[float, str]] = {}
+        # "hash|size|char|anchor" -> bounding box
+        self._bboxes: dict[str, tuple[float, float, float, float]] = {}
+        self._dirty: bool = False
+        self.measurements: int = 0
+
+        if self.cache_file and self.cache_file.exists():
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                self._bboxes = {key: tuple(bbox) for key, bbox in json.load(f).items()}
+
+    def font_hash(self, font_name: str) -> str:
+        """ Content hash of the font file, recomputed only if the file was modified """
+        mtime = os.path.getmtime(font_name)
+        cached = self._hashes.get(font_name)
+        if cached is None or cached[0] != mtime:
+            with open(font_name, "rb") as f:
+                cached = (mtime, hashlib.sha256(f.read()).hexdigest())
+            self._hashes[font_name] = cached
+        return cached[1]
+
+    def get_font(self, font_name: str, font_size: float) -> ImageFont.FreeTypeFont:
+        """ The font loaded at that size, loaded only the first time it is asked for """
+        key = (font_name, font_size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = ImageFont.truetype(font_name, font_size)
+            self._fonts[key] = font
+        return font
+
+    def bbox(self, font_name: str, font_size: float, char: str, anchor: str) -> tuple[float, float, float, float]:
+        """ Bounding box of the character, relative to its anchor
+
+        Same values as ImageDraw.textbbox((0, 0), char, font, anchor) on an RGBA image.
+        """
+        key = f"{self.font_hash(font_name)}|{font_size}|{char}|{anchor}"
+        bounding_box = self._bboxes.get(key)
+        if bounding_box is None:
+            # "L" is the font mode ImageDraw uses for RGBA images
+            bounding_box = self.get_font(font_name, font_size).getbbox(char, mode="L", anchor=anchor)
+            self._bboxes[key] = bounding_box
+            self._dirty = True
+            self.measurements += 1
+        return bounding_box
+
+    def save(self) -> None:
+        """ Write the metrics to the cache file, if there is one and something new was measured """
+        if not self.cache_file or not self._dirty:
+            return
+        temp_file = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(self._bboxes, f)
+        os.replace(temp_file, self.cache_file)
+        self._dirty = False
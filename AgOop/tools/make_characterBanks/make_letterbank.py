@@ -2,6 +2,8 @@ from PIL import Image, ImageDraw, ImageFont
 import math
 from pathlib import Path
 
+from glyph_metrics_cache import GlyphMetricsCache
+
 # Dimensions of current letter banks (large letters):
 # letter box: 80x90 pixels
 # bank size: 2160x90 pixels
@@ -31,6 +33,17 @@ font_name = "./Blue_Highway_Rg.otf"
 # font_name = "./CaskaydiaCoveNerdFontPropo-Bold.ttf"
 
 letter_colour = "black"
+
+# Loaded fonts and measured glyph bounding boxes are shared by all the banks.
+# Set a file name (e.g. "glyph_metrics_cache.json") to also keep the metrics between runs.
+glyph_metrics_cache_file: str | None = None
+glyph_cache: GlyphMetricsCache = GlyphMetricsCache(glyph_metrics_cache_file)
+
+# The font size search settles on whole sizes, unless the glyphs are still short of the bank
+# glyph height, then it looks for a fractional size (supported by FreeType and Pillow >= 10.1)
+fractional_font_sizes: bool = True
+fractional_font_size_steps: int = 8
+
 image_background_colour: str | tuple[int, int, int , int]
 if debug:
     image_background_colour = BG_WHITE
@@ -772,15 +785,15 @@ def get_max_ascender_and_descender_heights(font_name: str, font_size:int, from_B
     Returns:
         tuple[float, float]: max_ascender_height max_descender_height
     """
-    # With the test size, get the actual resulting metric
-    char_font:ImageFont.FreeTypeFont = ImageFont.truetype(font_name, font_size)
-
-    test_img:Image.Image = Image.new("RGBA",
-                            (font_size, font_size),
-                            image_background_colour)
-    test_draw:ImageDraw.ImageDraw = ImageDraw.Draw(test_img)
-    
     test_baseline:int = font_size * 3 // 4 # some value, cause something is needed
+
+    if test:
+        # With the test size, get the actual resulting metric
+        char_font:ImageFont.FreeTypeFont = glyph_cache.get_font(font_name, font_size)
+        test_img:Image.Image = Image.new("RGBA",
+                                (font_size, font_size),
+                                image_background_colour)
+        test_draw:ImageDraw.ImageDraw = ImageDraw.Draw(test_img)
     
     # initialise the max values
     max_ascender_height:float = 0
@@ -788,16 +801,19 @@ def get_max_ascender_and_descender_heights(font_name: str, font_size:int, from_B
     
     for char in from_Bank.characters_set:
         
-        # Get the bounding_box for this letter at the desired placement
-        bounding_box: tuple[float, float, float, float] = test_draw.textbbox((test_img.width/2, test_baseline), char, font=char_font, anchor=anchor)
+        # Get the bounding_box for this letter, relative to the anchor (measured once, then cached)
+        glyph_box: tuple[float, float, float, float] = glyph_cache.bbox(font_name, font_size, char, anchor)
         
         # Calculate the ascending and descending heights for this character
-        ascender_height:float = test_baseline - bounding_box[1]
-        descender_height:float = test_baseline - bounding_box[3]
+        ascender_height:float = -glyph_box[1]
+        descender_height:float = -glyph_box[3]
         # print(f"{char=}: {bounding_box}: {ascender_height=} - {descender_height=}")
         
         
         if test:
+            # the bounding_box at the desired placement on the test image
+            bounding_box = (font_size / 2 + glyph_box[0], test_baseline + glyph_box[1], font_size / 2 + glyph_box[2], test_baseline + glyph_box[3])
+
             # Print the ascending and descending heights
             test_draw.rectangle((0,test_baseline - ascender_height,test_img.width/2,test_baseline), fill="red")
             test_draw.rectangle((0,test_baseline,test_img.width/2,test_baseline - descender_height), fill="green")
@@ -826,32 +842,72 @@ def get_max_ascender_and_descender_heights(font_name: str, font_size:int, from_B
     # else:
     return max_ascender_height, max_descender_height
 
-def get_desired_font_size_for_string(font_name: str, from_bank: CharacterBank, anchor: str, test:bool = False) -> int:
+def get_glyph_band_height(font_name: str, font_size: float, from_bank: CharacterBank, anchor: str) -> float:
+    """ Height from the highest ascender to the lowest descender of the bank characters at that font size """
+    max_ascender_height, max_descender_height = get_max_ascender_and_descender_heights(font_name, font_size, from_bank, anchor)
+    return max_ascender_height - max_descender_height
+
+def get_desired_font_size_for_string(font_name: str, from_bank: CharacterBank, anchor: str, test:bool = False) -> float:
     """
-    Get the maximum ascender and descender heights of a set of characters of a specific font.
+    Get the font size at which the glyphs of the bank characters exactly fill from_bank.glyph_height.
     This is used to calculate the required font size for a character to fit in the character box.
+
+    A measurement at a test size gives a first, linear, estimate. Glyph boxes are whole pixels
+    and hinting is not linear, so the estimate is then corrected with a bisection over the sizes
+    around it: the largest whole size that does not overflow, then (when allowed) a fractional size
+    between it and the next whole size if the glyph band is still short.
+    The measurements come from glyph_cache, so each size costs one bbox per character at most.
+
+    Returns:
+        float: the font size (a whole number unless a fractional size was needed)
     """
-    test_max_ascender_height: float
-    test_max_descender_height: float
-    
+    target: int = from_bank.glyph_height
+
+    def band(size: float) -> float:
+        return get_glyph_band_height(font_name, size, from_bank, anchor)
+
     # Test size to get the metrics
     test_font_size: int = 200
 
-    # Calculate the ascender and descender heights for this font size
-    test_max_ascender_height, test_max_descender_height = get_max_ascender_and_descender_heights(font_name, test_font_size, from_bank, anchor)
-
-    # calculate the max size needed for the glyphs at that test_font_size for the characters used
-    max_test_glyph_size:float = test_max_ascender_height - test_max_descender_height
-    # print(f"{test_font_size=}: {max_test_glyph_size=}")
-    
     # create the adjuster for the font and for the ascender and descender sizes:
-    adjuster: float = test_font_size / max_test_glyph_size
-    # print(f"{adjuster=}")
-    
-    font_size: float = from_bank.glyph_height * adjuster
-    
-    # print(f"{from_bank.glyph_height} - {font_size1=}")
-    return int(font_size)
+    adjuster: float = test_font_size / band(test_font_size)
+    estimate: int = max(1, int(target * adjuster))
+
+    # Bracket the target: band(low) <= target < band(high)
+    low: int = estimate
+    while low > 1 and band(low) > target:
+        low = max(1, low - max(1, low // 8))
+    high: int = estimate + 1
+    while band(high) <= target:
+        high += max(1, high // 8)
+
+    # Largest whole size that does not overflow
+    while high - low > 1:
+        middle = (low + high) // 2
+        if band(middle) <= target:
+            low = middle
+        else:
+            high = middle
+    font_size: float = low
+
+    # Still short by a pixel or so: FreeType can also render fractional sizes
+    if fractional_font_sizes and band(font_size) < target:
+        low_size, high_size = float(low), float(high)
+        for _ in range(fractional_font_size_steps):
+            middle_size = (low_size + high_size) / 2
+            middle_band = band(middle_size)
+            if middle_band <= target:
+                low_size = middle_size
+                if middle_band == target:
+                    break
+            else:
+                high_size = middle_size
+        font_size = round(low_size, 3) if band(round(low_size, 3)) <= target else low_size
+
+    if test:
+        print(f"{from_bank.characters_set!r}: {font_size=} (linear estimate {estimate}), glyph band {band(font_size)} for {target=}")
+
+    return font_size
 
 # for debug
 def draw_ascender_and_descender_height(letterBank_drawing: ImageDraw.ImageDraw, position_of_anchor_on_pic: tuple[int, int], max_ascender_height: int, max_descender_height: int, width: int) -> None:
@@ -964,7 +1020,7 @@ def generate_letterBank_image(font: str, from_bank: CharacterBank) -> Image.Imag
     """
     
     # The font size used to generate the ImageFont item for the desired characterBank
-    font_size:int
+    font_size:float
     
     # The max ascender and descender for the characters used (not the whole font)
     # used to position the glyph on the image
@@ -988,10 +1044,10 @@ def generate_letterBank_image(font: str, from_bank: CharacterBank) -> Image.Imag
     font_size  = get_desired_font_size_for_string(font, from_bank, anchor)
     
     # Load the font with a needed size
-    char_font:ImageFont.FreeTypeFont = ImageFont.truetype(font_name, font_size)  
+    char_font:ImageFont.FreeTypeFont = glyph_cache.get_font(font, font_size)
     
     # get the max ascender and descenders resulting for the charaterst to be used
-    max_ascender_height, max_descender_height = get_max_ascender_and_descender_heights(font_name, font_size, from_bank, anchor)
+    max_ascender_height, max_descender_height = get_max_ascender_and_descender_heights(font, font_size, from_bank, anchor)
     
 
     # Get the umber of characters in the string
@@ -1058,8 +1114,8 @@ def generate_letterBank_image(font: str, from_bank: CharacterBank) -> Image.Imag
     if debug:
         assert letterBank_image.width == from_bank.bank_width
         assert letterBank_image.height == from_bank.bank_height
-        if font_size != from_bank.glyph_height:
-            print(f"font_size: {font_size} != from_bank.glyph_height: {from_bank.glyph_height}")
+        if max_ascender_height - max_descender_height != from_bank.glyph_height:
+            print(f"glyph band: {max_ascender_height - max_descender_height} != from_bank.glyph_height: {from_bank.glyph_height}")
     
     # Return the drawn image for printing
     return letterBank_image
@@ -1075,3 +1131,5 @@ if __name__ == "__main__":
     generate_letterBank_image(font_name, small_letters_bank).save(Path(outputPath) / "smallLetterBank.png")
     generate_letterBank_image(font_name, numbers_bank).save(Path(outputPath) / "numberBank.png")
 
+    glyph_cache.save()
+
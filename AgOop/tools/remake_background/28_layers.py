@@ -1,5 +1,5 @@
-import math
-import svgwrite
+from background_renderer import make_renderer
+from polygon_engine import regular_polygon, grow_polygon, resample_polygon, simplify_polygon
 
 # --- CONFIGURATION ---
 
@@ -10,6 +10,16 @@ initial_sides = 10  # e.g., decagon
 num_layers = 28
 radius_increment = 15
 rotation_deg = 30
+# .svg files are streamed polygon by polygon, .png files are rasterised directly
+output_files = ["28_layers.svg", "28_layers.png"]
+
+# Every layer doubles the vertex count of the previous one, so past a dozen layers
+# the polygons have to be brought back down to a bounded size.
+# "full" keeps every vertex (original behaviour), "bounded" first simplifies each layer
+# to simplify_tolerance pixels (if set) then resamples it to at most max_vertices points.
+growth_mode = "bounded"
+max_vertices = 2000
+simplify_tolerance = None  # e.g. 0.25 px
 
 # --- COLOR PALETTE (repeat as needed) ---
 colors = [
@@ -21,61 +31,30 @@ colors = [
 opacities = [0.9, 0.7, 0.7, 0.8, 0.9, 1.0] * 5  # repeat to cover all layers
 
 # --- INITIAL POLYGON (regular decagon) ---
-def regular_polygon(cx, cy, r, n, angle_offset=0):
-    return [
-        (
-            cx + r * math.cos(2 * math.pi * i / n + angle_offset),
-            cy + r * math.sin(2 * math.pi * i / n + angle_offset) * (height / width)
-        )
-        for i in range(n)
-    ]
-
-vertices = regular_polygon(center[0], center[1], initial_radius, initial_sides)
-
-# --- GROW POLYGON FUNCTION ---
-def grow_polygon(vertices, radius_increment, rotation_deg):
-    n = len(vertices)
-    new_vertices = []
-    angle_offset = math.radians(rotation_deg)
-    cx = sum(x for x, y in vertices) / n
-    cy = sum(y for x, y in vertices) / n
-
-    for i in range(n):
-        # Current vertex
-        x1, y1 = vertices[i]
-        # Next vertex (wrap around)
-        x2, y2 = vertices[(i + 1) % n]
-        # Add current vertex
-        new_vertices.append((x1, y1))
-        # Compute midpoint
-        mx, my = (x1 + x2) / 2, (y1 + y2) / 2
-        # Vector from center to midpoint
-        vx, vy = mx - cx, my - cy
-        # Increase length (grow outward)
-        length = math.hypot(vx, vy)
-        scale = (length + radius_increment) / length
-        gx, gy = cx + vx * scale, cy + vy * scale
-        # Rotate around center
-        dx, dy = gx - cx, gy - cy
-        angle = math.atan2(dy, dx) + angle_offset
-        r = math.hypot(dx, dy)
-        rx, ry = cx + r * math.cos(angle), cy + r * math.sin(angle)
-        # Add new vertex
-        new_vertices.append((rx, ry))
-    return new_vertices
-
-# --- SVG DRAWING ---
-dwg = svgwrite.Drawing("28_layers.svg", size=(width, height))
-layer_vertices = [vertices]
+vertices = regular_polygon(center[0], center[1], initial_radius, initial_sides, y_scale=height / width)
+
+# --- BOUND POLYGON SIZE ---
+def bound_polygon(vertices):
+    """Apply the configured growth_mode limit to a freshly grown layer."""
+    if growth_mode == "full":
+        return vertices
+    if simplify_tolerance is not None:
+        vertices = simplify_polygon(vertices, simplify_tolerance)
+    return resample_polygon(vertices, max_vertices)
+
+# --- DRAWING ---
+renderers = [make_renderer(output_file, width, height) for output_file in output_files]
+# Only the layer being drawn is kept alive, the previous ones are already in the outputs
+points = vertices
 
 for i in range(num_layers):
     color = colors[i % len(colors)]
     opacity = opacities[i % len(opacities)]
-    points = layer_vertices[-1]
-    dwg.add(dwg.polygon(points, fill=color, opacity=opacity, stroke="none"))
+    for renderer in renderers:
+        renderer.add_polygon(points, fill=color, opacity=opacity)
     # Prepare next layer
-    next_points = grow_polygon(points, radius_increment, rotation_deg)
-    layer_vertices.append(next_points)
+    points = bound_polygon(grow_polygon(points, radius_increment, rotation_deg))
 
-dwg.save()
-print("SVG saved as 28_layers.svg")
\ No newline at end of file
+for renderer in renderers:
+    renderer.save()
+    print(f"Saved {renderer.filename}")
\ No newline at end of file
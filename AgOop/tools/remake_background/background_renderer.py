@@ -0,0 +1,132 @@
+"""Output backends for the background scripts.
+
+RasterRenderer fills the translucent polygons straight into an RGBA buffer and writes
+the PNG the game uses (res/i18n/*/images/background.png), no SVG step needed.
+StreamingSvgWriter writes each polygon to the SVG file as it is added, so the
+document is never held in memory.
+
+Both share the same small interface: add_polygon(points, fill, opacity) then save().
+"""
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+
+def hex_to_rgb(colour):
+    """'#rrggbb' to an (r, g, b) tuple of floats in 0..1."""
+    colour = colour.lstrip("#")
+    return tuple(int(colour[i:i + 2], 16) / 255 for i in (0, 2, 4))
+
+
+class RasterRenderer:
+    """Scanline polygon filler with alpha compositing, anti-aliased by supersampling."""
+
+    def __init__(self, filename, width, height, supersample=4):
+        self.filename = filename
+        self.width = width
+        self.height = height
+        self.supersample = supersample
+        # Premultiplied RGBA, starts fully transparent like an SVG without background
+        self.buffer = np.zeros((height, width, 4), dtype=np.float32)
+
+    def coverage(self, points):
+        """Fraction of each pixel covered by the polygon (nonzero fill rule, as SVG).
+
+        Only the pixels inside the polygon bounding box are computed.
+        Every edge adds its winding direction (+1/-1) at the first covered sample of each
+        scanline it crosses, a cumulative sum along the rows then gives the winding number
+        of every sample.
+
+        Returns:
+            tuple[tuple[slice, slice], np.ndarray]: the pixel window and its coverage
+        """
+        ss = self.supersample
+        vertices = np.asarray(points, dtype=float)
+        left, top = np.clip(np.floor(vertices.min(axis=0)).astype(int), 0, (self.width, self.height))
+        right, bottom = np.clip(np.ceil(vertices.max(axis=0)).astype(int), 0, (self.width, self.height))
+        window = (slice(top, bottom), slice(left, right))
+        rows, cols = (bottom - top) * ss, (right - left) * ss
+        if rows == 0 or cols == 0:
+            return window, np.zeros((bottom - top, right - left), dtype=np.float32)
+
+        # Supersampled coordinates relative to the window
+        vertices = (vertices - (left, top)) * ss
+        start = vertices
+        end = np.roll(vertices, -1, axis=0)
+
+        y_min = np.minimum(start[:, 1], end[:, 1])
+        y_max = np.maximum(start[:, 1], end[:, 1])
+        # Scanlines run through the sample centres: row j is at y = j + 0.5
+        first_row = np.clip(np.ceil(y_min - 0.5), 0, rows).astype(np.int64)
+        last_row = np.clip(np.ceil(y_max - 0.5), 0, rows).astype(np.int64)
+        spans = last_row - first_row
+        crossing = spans > 0
+        start, end, first_row, spans = start[crossing], end[crossing], first_row[crossing], spans[crossing]
+
+        # One entry per (edge, scanline) pair
+        edge = np.repeat(np.arange(len(spans)), spans)
+        row = first_row[edge] + np.arange(spans.sum()) - np.repeat(np.cumsum(spans) - spans, spans)
+        x0, y0 = start[edge, 0], start[edge, 1]
+        x1, y1 = end[edge, 0], end[edge, 1]
+        x = x0 + (row + 0.5 - y0) * (x1 - x0) / (y1 - y0)
+        column = np.clip(np.ceil(x - 0.5), 0, cols).astype(np.int64)
+        direction = np.where(y1 > y0, 1.0, -1.0)
+
+        winding = np.bincount(row * (cols + 1) + column, weights=direction, minlength=rows * (cols + 1))
+        inside = np.cumsum(winding.reshape(rows, cols + 1)[:, :cols], axis=1) != 0
+        return window, inside.reshape(rows // ss, ss, cols // ss, ss).mean(axis=(1, 3), dtype=np.float32)
+
+    def add_polygon(self, points, fill, opacity=1.0):
+        """Composite the polygon over what is already drawn (SVG source-over)."""
+        window, coverage = self.coverage(points)
+        alpha = coverage * opacity
+        target = self.buffer[window]
+        target *= (1 - alpha)[..., None]
+        target[..., :3] += np.multiply.outer(alpha, hex_to_rgb(fill)).astype(np.float32)
+        target[..., 3] += alpha
+
+    def image(self):
+        """The buffer as a straight-alpha 8 bit RGBA PIL image."""
+        alpha = self.buffer[..., 3:]
+        rgb = np.divide(self.buffer[..., :3], alpha, out=np.zeros_like(self.buffer[..., :3]), where=alpha > 0)
+        pixels = np.concatenate([rgb, alpha], axis=2)
+        return Image.fromarray(np.round(np.clip(pixels, 0, 1) * 255).astype(np.uint8), "RGBA")
+
+    def save(self):
+        self.image().save(self.filename)
+
+
+class StreamingSvgWriter:
+    """Writes polygons to an SVG file one element at a time."""
+
+    def __init__(self, filename, width, height):
+        self.filename = filename
+        self.file = open(filename, "w", encoding="utf-8")
+        self.file.write(
+            '<?xml version="1.0" encoding="utf-8" ?>\n'
+            f'<svg baseProfile="full" height="{height}" version="1.1" width="{width}" '
+            'xmlns="http://www.w3.org/2000/svg" xmlns:ev="http://www.w3.org/2001/xml-events" '
+            'xmlns:xlink="http://www.w3.org/1999/xlink"><defs />'
+        )
+
+    def add_polygon(self, points, fill, opacity=1.0):
+        self.file.write(f'<polygon fill="{fill}" opacity="{opacity}" points="')
+        # Chunked so a huge point list never becomes one giant string
+        points = np.asarray(points, dtype=float)
+        for i in range(0, len(points), 4096):
+            if i:
+                self.file.write(" ")
+            self.file.write(" ".join(f"{x:.3f},{y:.3f}" for x, y in points[i:i + 4096].tolist()))
+        self.file.write('" stroke="none" />')
+
+    def save(self):
+        self.file.write("</svg>")
+        self.file.close()
+
+
+def make_renderer(filename, width, height):
+    """Pick the backend from the file extension: .png is rasterised, anything else is SVG."""
+    if Path(filename).suffix.lower() == ".png":
+        return RasterRenderer(filename, width, height)
+    return StreamingSvgWriter(filename, width, height)
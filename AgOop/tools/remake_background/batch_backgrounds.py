@@ -0,0 +1,136 @@
+"""Batch generation of seeded background variants across a process pool.
+
+Every variant is a seed plus parameters (the make_background_image.py defaults,
+optionally overridden). The output file is named after a hash of both, so a
+variant that was already rendered is never rendered again.
+
+Examples:
+    python batch_backgrounds.py --count 8 --seed 100
+    python batch_backgrounds.py --variants variants.json
+    python batch_backgrounds.py --locales --install
+
+variants.json is a list of {"name": ..., "seed": ..., "parameters": {...overrides}}.
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from PIL import Image, ImageColor
+
+from make_background_image import default_parameters, make_background
+
+# Bump when the drawing code changes, so cached renders are not reused
+RENDER_VERSION = 1
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+LOCALES_DIR = SCRIPT_DIR / ".." / ".." / "res" / "i18n"
+DEFAULT_OUTPUT_DIR = SCRIPT_DIR / "variants"
+# The game stretches images/background.png to the screen (spritemanager.cs), keep it opaque and at that size
+GAME_BACKGROUND_SIZE = (800, 600)
+
+
+def variant_hash(parameters, seed):
+    """Content address of a variant: same parameters and seed, same hash."""
+    key = json.dumps({"version": RENDER_VERSION, "seed": seed, "parameters": parameters}, sort_keys=True)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+def render_variant(job):
+    """Render one variant if its file does not exist yet. Runs in a worker process.
+
+    Returns:
+        tuple[str, str, bool, float]: name, output path, whether it was rendered, seconds
+    """
+    name, seed, parameters, output_file = job
+    if os.path.exists(output_file):
+        return name, output_file, False, 0.0
+
+    start = time.perf_counter()
+    # Written under a temporary name first so an interrupted run never leaves a "cached" partial file
+    temp_file = f"{output_file[:-4]}.{os.getpid()}.tmp.png"
+    make_background([temp_file], parameters, seed)
+    os.replace(temp_file, output_file)
+    with open(f"{output_file[:-4]}.json", "w", encoding="utf-8") as f:
+        json.dump({"name": name, "seed": seed, "parameters": parameters}, f, indent=2)
+    return name, output_file, True, time.perf_counter() - start
+
+
+def install_background(output_file, parameters, target):
+    """Install a render as a locale background: on an opaque canvas of the game screen size.
+
+    The render is centred on a canvas filled with the outermost ring colour, so its transparent
+    corners and the rows it lacks are not shown black, and it is not stretched by the game.
+    """
+    with Image.open(output_file) as render:
+        render = render.convert("RGBA")
+    if render.width > GAME_BACKGROUND_SIZE[0] or render.height > GAME_BACKGROUND_SIZE[1]:
+        raise ValueError(f"{output_file} is {render.width}x{render.height}, larger than the game screen "
+                         f"{GAME_BACKGROUND_SIZE[0]}x{GAME_BACKGROUND_SIZE[1]}")
+    canvas = Image.new("RGBA", GAME_BACKGROUND_SIZE, ImageColor.getrgb(parameters["colors"][-1]))
+    canvas.alpha_composite(render, ((GAME_BACKGROUND_SIZE[0] - render.width) // 2,
+                                    (GAME_BACKGROUND_SIZE[1] - render.height) // 2))
+    temp_file = f"{target}.{os.getpid()}.tmp.png"
+    canvas.convert("RGB").save(temp_file)
+    os.replace(temp_file, target)
+
+
+def build_variants(args):
+    """List of (name, seed, parameter overrides) from the command line options."""
+    if args.variants:
+        with open(args.variants, "r", encoding="utf-8") as f:
+            return [(v["name"], v["seed"], v.get("parameters", {})) for v in json.load(f)]
+    if args.locales:
+        # One background per locale, seeded by the locale name so it is stable between runs
+        return [(locale.name, locale.name, {}) for locale in sorted(LOCALES_DIR.iterdir()) if locale.is_dir()]
+    return [(f"variant_{args.seed + i}", args.seed + i, {}) for i in range(args.count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render deterministic background variants in parallel.")
+    parser.add_argument("--count", type=int, default=4, help="number of variants, seeded from --seed upwards")
+    parser.add_argument("--seed", type=int, default=0, help="first seed when using --count")
+    parser.add_argument("--variants", help="JSON file listing name/seed/parameters per variant")
+    parser.add_argument("--locales", action="store_true", help="one variant per locale under res/i18n")
+    parser.add_argument("--install", action="store_true", help="with --locales, install each render as res/i18n/<locale>/images/background.png (opaque, 800x600)")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR, help="content-addressed render cache")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    jobs = []
+    for name, seed, overrides in build_variants(args):
+        parameters = default_parameters()
+        parameters.update(overrides)
+        output_file = str(output_dir / f"{variant_hash(parameters, seed)}.png")
+        jobs.append((name, seed, parameters, output_file))
+
+    # Identical variants share an output file: render it once
+    unique_jobs = {}
+    for job in jobs:
+        unique_jobs.setdefault(job[3], job)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results = {output_file: (was_rendered, seconds)
+                   for _, output_file, was_rendered, seconds in pool.map(render_variant, unique_jobs.values())}
+
+    for name, _, parameters, output_file in jobs:
+        was_rendered, seconds = results[output_file]
+        status = f"rendered in {seconds:.2f}s" if was_rendered else "cached"
+        print(f"{name}: {output_file} ({status})")
+        if args.locales and args.install:
+            install_background(output_file, parameters, LOCALES_DIR / name / "images" / "background.png")
+    rendered = sum(was_rendered for was_rendered, _ in results.values())
+
+    print(f"{len(jobs)} variants, {len(results)} distinct, {rendered} rendered, {len(results) - rendered} cached, "
+          f"{time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
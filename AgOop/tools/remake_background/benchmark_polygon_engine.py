@@ -0,0 +1,79 @@
+"""Per-layer throughput of polygon_engine against the original pure Python loops of 28_layers.py.
+
+Grows the same decagon layer after layer with both implementations, checks they agree,
+and prints the vertices generated per second for each layer.
+"""
+import math
+import time
+
+import numpy as np
+
+import polygon_engine
+
+width, height = 800, 557
+center = (width / 2, height / 2)
+initial_radius = 60
+initial_sides = 10
+num_layers = 16  # the loop version doubles its vertices per layer, keep it reasonable
+radius_increment = 15
+rotation_deg = 30
+repeats = 3
+
+
+# --- ORIGINAL LOOPS (from 28_layers.py) ---
+def regular_polygon_loop(cx, cy, r, n, angle_offset=0):
+    return [
+        (
+            cx + r * math.cos(2 * math.pi * i / n + angle_offset),
+            cy + r * math.sin(2 * math.pi * i / n + angle_offset) * (height / width)
+        )
+        for i in range(n)
+    ]
+
+def grow_polygon_loop(vertices, radius_increment, rotation_deg):
+    n = len(vertices)
+    new_vertices = []
+    angle_offset = math.radians(rotation_deg)
+    cx = sum(x for x, y in vertices) / n
+    cy = sum(y for x, y in vertices) / n
+
+    for i in range(n):
+        x1, y1 = vertices[i]
+        x2, y2 = vertices[(i + 1) % n]
+        new_vertices.append((x1, y1))
+        mx, my = (x1 + x2) / 2, (y1 + y2) / 2
+        vx, vy = mx - cx, my - cy
+        length = math.hypot(vx, vy)
+        scale = (length + radius_increment) / length
+        gx, gy = cx + vx * scale, cy + vy * scale
+        dx, dy = gx - cx, gy - cy
+        angle = math.atan2(dy, dx) + angle_offset
+        r = math.hypot(dx, dy)
+        rx, ry = cx + r * math.cos(angle), cy + r * math.sin(angle)
+        new_vertices.append((rx, ry))
+    return new_vertices
+
+
+def best_time(function, *args):
+    """Best wall time over a few repeats, and the last result."""
+    best = math.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+if __name__ == "__main__":
+    loop_points = regular_polygon_loop(center[0], center[1], initial_radius, initial_sides)
+    array_points = polygon_engine.regular_polygon(center[0], center[1], initial_radius, initial_sides, y_scale=height / width)
+    assert np.allclose(loop_points, array_points)
+
+    print(f"{'layer':>5} {'vertices':>9} {'loop (v/s)':>14} {'numpy (v/s)':>14} {'speedup':>8}")
+    for layer in range(1, num_layers + 1):
+        loop_time, loop_points = best_time(grow_polygon_loop, loop_points, radius_increment, rotation_deg)
+        array_time, array_points = best_time(polygon_engine.grow_polygon, array_points, radius_increment, rotation_deg)
+        assert np.allclose(loop_points, array_points)
+
+        count = len(array_points)
+        print(f"{layer:>5} {count:>9} {count / loop_time:>14,.0f} {count / array_time:>14,.0f} {loop_time / array_time:>7.1f}x")
@@ -1,17 +1,44 @@
 import math
+import sys
 from svgpathtools import svg2paths
 
+def path_points(path):
+    """Start point of every segment of the path, duplicates removed, order kept."""
+    # dict keys are hashed and keep insertion order, unlike the `in list` check this is O(n)
+    return list(dict.fromkeys((e.start.real, e.start.imag) for e in path))
+
+def path_size(points):
+    """Bounding box area of the points, a cheap stand-in for path.length() to pick the largest path."""
+    if not points:
+        return 0.0
+    xs = [x for x, y in points]
+    ys = [y for x, y in points]
+    return (max(xs) - min(xs)) * (max(ys) - min(ys))
+
+def extract_polygons(svg_file):
+    """Vertices of every path in the file, parsed in one pass, in document order.
+
+    Returns:
+        list[tuple[dict, list[tuple[float, float]]]]: the svg attributes and vertices of each path
+    """
+    paths, attributes = svg2paths(svg_file)
+    return [(attr, path_points(path)) for path, attr in zip(paths, attributes) if len(path)]
+
 def extract_polygon_points(svg_file):
-    paths, _ = svg2paths(svg_file)
-    path = max(paths, key=lambda p: p.length())
-    points = []
-    for e in path:
-        points.append((e.start.real, e.start.imag))
-    unique_points = []
-    for pt in points:
-        if pt not in unique_points:
-            unique_points.append(pt)
-    return unique_points
+    """Vertices of the largest path of the file."""
+    return max((points for _, points in extract_polygons(svg_file)), key=path_size)
+
+def extract_layers(svg_files):
+    """Polygons to compare, smallest (innermost) first.
+
+    A single file is treated as a whole background, every path in it being a layer.
+    Several files are treated as one layer each, the largest path of each file.
+    """
+    if len(svg_files) == 1:
+        polygons = [points for _, points in extract_polygons(svg_files[0])]
+    else:
+        polygons = [extract_polygon_points(svg_file) for svg_file in svg_files]
+    return sorted(polygons, key=path_size)
 
 def centroid(points):
     x = sum(p[0] for p in points) / len(points)
@@ -52,20 +79,17 @@ def best_rotation(polyA, polyB):
     avg_diff = sum(diffs) / len(diffs)
     return math.degrees(avg_diff)
 
-# Extract polygons from your three SVGs
-poly1 = extract_polygon_points("1.svg")
-poly2 = extract_polygon_points("2.svg")
-poly3 = extract_polygon_points("3.svg")
-
-print(f"poly1: {len(poly1)} points")
-print(f"poly2: {len(poly2)} points")
-print(f"poly3: {len(poly3)} points")
+if __name__ == "__main__":
+    # Either one many-layer SVG, or one SVG per layer (defaults to the three sample layers)
+    svg_files = sys.argv[1:] or ["1.svg", "2.svg", "3.svg"]
+    polygons = extract_layers(svg_files)
 
-compare_polygons(poly1, poly2)
-compare_polygons(poly2, poly3)
+    for i, poly in enumerate(polygons, start=1):
+        print(f"poly{i}: {len(poly)} points")
 
-rot12 = best_rotation(poly1, poly2)
-rot23 = best_rotation(poly2, poly3)
+    for i in range(len(polygons) - 1):
+        compare_polygons(polygons[i], polygons[i + 1])
 
-print(f"Estimated rotation from layer 1 to 2: {rot12:.2f} degrees")
-print(f"Estimated rotation from layer 2 to 3: {rot23:.2f} degrees")
\ No newline at end of file
+    for i in range(len(polygons) - 1):
+        rotation = best_rotation(polygons[i], polygons[i + 1])
+        print(f"Estimated rotation from layer {i + 1} to {i + 2}: {rotation:.2f} degrees")
@@ -0,0 +1,163 @@
+"""Recover the 28_layers.py generation parameters from every layer of an SVG at once.
+
+28_layers.py grows each layer from the previous one (polygon_engine.grow_polygon): every
+vertex is kept, and after each one the midpoint of its edge is inserted, pushed
+radius_increment outward and rotated rotation_deg around the centroid. For each
+consecutive pair of layers (innermost first) this fits that model:
+    radius_increment: how far the inserted vertices are pushed out from their parent midpoints
+    rotation_deg:     how far they are rotated from them around the centroid
+The squash (height / width in 28_layers.py) is only applied to the initial regular polygon:
+it is the vertical / horizontal spread of the innermost layer. The spread of the other layers
+is reported per pair as a diagnostic only, growing and rotating changes it.
+
+A pair that was not grown that way (the outer layer does not hold the inner one's vertices
+every other vertex, e.g. hand drawn layers, or the layers 28_layers.py resamples once they pass
+max_vertices with growth_mode = "bounded") gets NaN and is left out of the medians.
+
+Usage:
+    python fit_layer_parameters.py background.svg
+"""
+import sys
+import time
+
+import numpy as np
+
+from extract_vertices_angles_from_svg import extract_layers
+from polygon_engine import centroid, midpoints
+
+# Largest distance, in pixels, between a vertex and its copy in the next layer (SVG rounding)
+KEPT_VERTEX_TOLERANCE = 0.5
+
+
+def flatten_layers(polygons):
+    """All vertices in one (V, 2) array, plus the layer index of each vertex."""
+    counts = np.array([len(p) for p in polygons])
+    vertices = np.concatenate([np.asarray(p, dtype=float) for p in polygons])
+    layer = np.repeat(np.arange(len(polygons)), counts)
+    return vertices, layer, counts
+
+
+def match_inserted_vertices(previous, grown, tolerance=KEPT_VERTEX_TOLERANCE):
+    """Pair each vertex inserted by the growth with the midpoint of its parent edge.
+
+    The grown layer must hold the previous vertices every other vertex, in the same order
+    (starting anywhere): the vertex after the copy of vertex i was inserted on edge i.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray] | None: (inserted vertices, parent midpoints), both (N, 2),
+        None if the grown layer does not follow the model
+    """
+    n = len(previous)
+    if len(grown) != 2 * n:
+        return None
+    start = int(np.argmin(((grown - previous[0]) ** 2).sum(axis=1)))
+    order = (start + np.arange(2 * n)) % (2 * n)
+    kept, inserted = grown[order[0::2]], grown[order[1::2]]
+    if np.hypot(*(kept - previous).T).max() > tolerance:
+        return None
+    return inserted, midpoints(previous)
+
+
+def fit_growth(previous, grown, tolerance=KEPT_VERTEX_TOLERANCE):
+    """radius_increment and rotation_deg of grow_polygon(previous, ...) giving grown, NaN if it does not.
+
+    Around the centroid of previous, each inserted vertex is its parent midpoint rotated by the
+    rotation and moved radius_increment further out: the two are the mean radial difference
+    and the circular mean of the angle difference.
+    """
+    matched = match_inserted_vertices(np.asarray(previous, dtype=float), np.asarray(grown, dtype=float), tolerance)
+    if matched is None:
+        return np.nan, np.nan
+    inserted, parents = matched
+    center = centroid(np.asarray(previous, dtype=float))
+    inserted = (inserted - center) @ np.array([1, 1j])
+    parents = (parents - center) @ np.array([1, 1j])
+    radius_increment = float(np.mean(np.abs(inserted) - np.abs(parents)))
+    turns = inserted / parents
+    rotation_deg = float(np.degrees(np.angle(np.sum(turns / np.abs(turns)))))
+    return radius_increment, rotation_deg
+
+
+def fit_layers(polygons, tolerance=KEPT_VERTEX_TOLERANCE):
+    """Fit the generation parameters between every pair of consecutive layers.
+
+    Args:
+        polygons (list): vertices of each layer, innermost first
+        tolerance (float): see match_inserted_vertices
+
+    Returns:
+        dict: per-pair arrays (radius_increment, rotation_deg, grown, squash of the outer layer),
+        the medians of radius_increment and rotation_deg over the grown pairs, and height_width
+        (the squash of the innermost layer)
+    """
+    vertices, layer, counts = flatten_layers(polygons)
+
+    # Aspect squash from the second moments of each layer, around its centroid
+    centroids = np.stack([
+        np.bincount(layer, weights=vertices[:, 0]),
+        np.bincount(layer, weights=vertices[:, 1]),
+    ], axis=1) / counts[:, None]
+    offsets = vertices - centroids[layer]
+    spread_x = np.bincount(layer, weights=offsets[:, 0] ** 2)
+    spread_y = np.bincount(layer, weights=offsets[:, 1] ** 2)
+    squash = np.sqrt(spread_y / spread_x)
+
+    fits = np.array([fit_growth(previous, grown, tolerance) for previous, grown in zip(polygons, polygons[1:])])
+    fits = fits.reshape(-1, 2)
+    radius_increment, rotation_deg = fits[:, 0], fits[:, 1]
+    grown = ~np.isnan(radius_increment)
+
+    def median(values):
+        return float(np.median(values)) if len(values) else float("nan")
+
+    return {
+        "vertices": counts,
+        "radius_increment": radius_increment,
+        "rotation_deg": rotation_deg,
+        "grown": grown,
+        "squash": squash[1:],
+        "median_radius_increment": median(radius_increment[grown]),
+        "median_rotation_deg": median(rotation_deg[grown]),
+        # Exact for the initial regular polygon
+        "height_width": float(squash[0]),
+    }
+
+
+def _pair_list(pairs):
+    return ", ".join(f"{i + 1}->{i + 2}" for i in pairs)
+
+
+def print_report(fit):
+    print(f"{'pair':>7} {'vertices':>11} {'Δr':>8} {'θ (deg)':>8} {'squash':>7}")
+    for i in range(len(fit["radius_increment"])):
+        pair = f"{i + 1}->{i + 2}"
+        counts = f"{fit['vertices'][i]}->{fit['vertices'][i + 1]}"
+        print(f"{pair:>7} {counts:>11} {fit['radius_increment'][i]:>8.2f} {fit['rotation_deg'][i]:>8.2f} {fit['squash'][i]:>7.3f}")
+    print("(squash per pair: spread of the outer layer, a diagnostic, not the generation parameter)")
+
+    not_grown = np.flatnonzero(~fit["grown"])
+    if len(not_grown):
+        counts = fit["vertices"]
+        not_doubling = [i for i in not_grown if counts[i + 1] != 2 * counts[i]]
+        not_kept = [i for i in not_grown if counts[i + 1] == 2 * counts[i]]
+        print(f"{len(not_grown)} of {len(fit['grown'])} pairs are NaN, not grown by grow_polygon:")
+        if not_doubling:
+            print(f"  vertex count does not double (hand drawn, or resampled by growth_mode = \"bounded\"): "
+                  f"{_pair_list(not_doubling)}")
+        if not_kept:
+            print(f"  the inner layer's vertices are not in the outer layer: {_pair_list(not_kept)}")
+    print(f"radius_increment = {fit['median_radius_increment']:.2f}")
+    print(f"rotation_deg = {fit['median_rotation_deg']:.2f}")
+    print(f"squash (height / width) = {fit['height_width']:.3f} (innermost layer)")
+
+
+if __name__ == "__main__":
+    svg_files = sys.argv[1:] or ["background.svg"]
+    polygons = [p for p in extract_layers(svg_files) if len(p) >= 3]
+
+    start = time.perf_counter()
+    fit = fit_layers(polygons)
+    elapsed = time.perf_counter() - start
+
+    print_report(fit)
+    print(f"Fitted {len(polygons)} layers in {elapsed * 1000:.1f} ms")
@@ -1,7 +1,108 @@
+"""Palette of a background image, in the colors / opacities format of 28_layers.py.
+
+image.getcolors(maxcolors=254) gives up (returns None) on anti-aliased images,
+so instead every RGBA pixel is packed into one integer and all of them are counted
+in a single pass. The palette is then either the K most frequent colours, or K
+colours quantised with a count-weighted k-means over the distinct colours.
+
+Usage:
+    python identify_colours.py background.png
+    python identify_colours.py --kmeans 12 background.png
+    python identify_colours.py --locales
+"""
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
 from PIL import Image
 
-image = Image.open("background.png")
+LOCALES_DIR = Path(__file__).resolve().parent / ".." / ".." / "res" / "i18n"
+
+
+def count_colours(image):
+    """Distinct RGBA colours of the image and how many pixels use each.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (C, 4) uint8 colours, (C,) counts, most frequent first
+    """
+    pixels = np.asarray(image.convert("RGBA"), dtype=np.uint32).reshape(-1, 4)
+    packed = (pixels[:, 0] << 24) | (pixels[:, 1] << 16) | (pixels[:, 2] << 8) | pixels[:, 3]
+    # Fully transparent pixels are not part of the palette
+    packed = packed[(packed & 0xFF) != 0]
+    values, counts = np.unique(packed, return_counts=True)
+
+    order = np.argsort(-counts, kind="stable")
+    values, counts = values[order], counts[order]
+    colours = np.stack([(values >> shift) & 0xFF for shift in (24, 16, 8, 0)], axis=1).astype(np.uint8)
+    return colours, counts
+
+
+def top_colours(colours, counts, k):
+    """The k most frequent colours."""
+    return colours[:k], counts[:k]
+
+
+def kmeans_colours(colours, counts, k, iterations=20):
+    """Quantise to k colours with a k-means weighted by pixel counts.
+
+    Runs on the distinct colours rather than on every pixel, seeded with the k most frequent.
+    """
+    points = colours.astype(np.float64)
+    weights = counts.astype(np.float64)
+    centres = points[:k].copy()
+    for _ in range(iterations):
+        # |p - c|^2 without the |p|^2 term, which is the same for every centre: (C, k) not (C, k, 4)
+        distances = (centres ** 2).sum(axis=1) - 2 * points @ centres.T
+        nearest = np.argmin(distances, axis=1)
+        totals = np.bincount(nearest, weights=weights, minlength=len(centres))
+        moved = np.stack([np.bincount(nearest, weights=weights * points[:, c], minlength=len(centres)) for c in range(4)], axis=1)
+        used = totals > 0
+        new_centres = centres.copy()
+        new_centres[used] = moved[used] / totals[used, None]
+        if np.allclose(new_centres, centres):
+            break
+        centres = new_centres
+
+    order = np.argsort(-totals, kind="stable")
+    used = totals[order] > 0
+    return np.round(centres[order][used]).astype(np.uint8), totals[order][used].astype(np.int64)
+
+
+def format_palette(colours):
+    """colors = [...] and opacities = [...] lines, ready to paste into 28_layers.py."""
+    hex_colours = ", ".join(f'"#{r:02x}{g:02x}{b:02x}"' for r, g, b, _ in colours.tolist())
+    opacities = ", ".join(f"{a / 255:.2f}" for *_, a in colours.tolist())
+    return f"colors = [{hex_colours}]\nopacities = [{opacities}]"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract the colour palette of background images.")
+    parser.add_argument("images", nargs="*", help="images to analyse (default: background.png)")
+    parser.add_argument("--locales", action="store_true", help="analyse res/i18n/*/images/background.png")
+    parser.add_argument("--top", type=int, default=28, help="number of colours to keep (default: 28, one per layer)")
+    parser.add_argument("--kmeans", type=int, default=None, help="quantise to this many colours instead of taking the most frequent")
+    args = parser.parse_args()
+
+    images = [Path(image) for image in args.images]
+    if args.locales:
+        images += sorted(LOCALES_DIR.glob("*/images/background.png"))
+    if not images:
+        images = [Path("background.png")]
+
+    for image_file in images:
+        start = time.perf_counter()
+        with Image.open(image_file) as image:
+            colours, counts = count_colours(image)
+        if args.kmeans:
+            palette, _ = kmeans_colours(colours, counts, args.kmeans)
+        else:
+            palette, _ = top_colours(colours, counts, args.top)
+        elapsed = time.perf_counter() - start
+
+        print(f"# {image_file}: {len(colours)} distinct colours, {elapsed * 1000:.0f} ms")
+        print(format_palette(palette))
 
-colours = image.getcolors(maxcolors=254)
 
-print(len(colours))
\ No newline at end of file
+if __name__ == "__main__":
+    main()
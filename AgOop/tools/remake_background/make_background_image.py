@@ -1,7 +1,9 @@
-import svgwrite
 import math
 import random
 
+from background_renderer import make_renderer
+from polygon_engine import regular_polygon
+
 # Parameters
 width, height = 800, 557
 center = (width // 2 + 20, height // 2 - 20)  # Offset to match your image
@@ -9,6 +11,9 @@ num_rings = 7
 num_sides = 10
 min_radius = 80
 max_radius = 400
+jitter = 0.08  # fraction of the ring radius each vertex can move in or out
+# .svg files are streamed polygon by polygon, .png files are rasterised directly
+output_files = ["radial_polygons.svg", "radial_polygons.png"]
 
 # Colors and opacities (approximate from your image)
 colors = [
@@ -22,27 +27,53 @@ colors = [
 ]
 opacities = [0.9, 0.7, 0.7, 0.8, 0.9, 1.0, 1.0]
 
-dwg = svgwrite.Drawing("radial_polygons.svg", size=(width, height))
-
-for i in reversed(range(num_rings)):
-    radius = min_radius + (max_radius - min_radius) * i / (num_rings - 1)
-    angle_offset = (i % 2) * (math.pi / num_sides)  # alternate rotation for variety
-    points = []
-    for j in range(num_sides):
-        angle = 2 * math.pi * j / num_sides + angle_offset
-        # Add jitter for organic look
-        jitter = random.uniform(-0.08, 0.08) * radius
-        x = center[0] + (radius + jitter) * math.cos(angle)
-        y = center[1] + (radius + jitter) * math.sin(angle) * (height / width)
-        points.append((x, y))
-    dwg.add(
-        dwg.polygon(
-            points,
-            fill=colors[i % len(colors)],
-            opacity=opacities[i % len(opacities)],
-            stroke="none"
-        )
-    )
-
-dwg.save()
-print("SVG saved as radial_polygons.svg")
\ No newline at end of file
+
+def default_parameters():
+    """The module parameters above, as the dict make_background takes."""
+    return {
+        "width": width,
+        "height": height,
+        "center": list(center),
+        "num_rings": num_rings,
+        "num_sides": num_sides,
+        "min_radius": min_radius,
+        "max_radius": max_radius,
+        "jitter": jitter,
+        "colors": list(colors),
+        "opacities": list(opacities),
+    }
+
+
+def make_background(output_files, parameters, seed=None):
+    """Draw the jittered rings into every file of output_files.
+
+    Args:
+        output_files (list[str]): .svg and/or .png files to write
+        parameters (dict): as returned by default_parameters()
+        seed (int | str | None): jitter seed, the same seed and parameters always give the same image
+    """
+    rng = random.Random(seed)
+    p = parameters
+    renderers = [make_renderer(output_file, p["width"], p["height"]) for output_file in output_files]
+
+    for i in reversed(range(p["num_rings"])):
+        radius = p["min_radius"] + (p["max_radius"] - p["min_radius"]) * i / (p["num_rings"] - 1)
+        angle_offset = (i % 2) * (math.pi / p["num_sides"])  # alternate rotation for variety
+        # Add jitter for organic look, one radius per vertex
+        radii = [radius + rng.uniform(-p["jitter"], p["jitter"]) * radius for _ in range(p["num_sides"])]
+        points = regular_polygon(p["center"][0], p["center"][1], radii, p["num_sides"], angle_offset, p["height"] / p["width"])
+        for renderer in renderers:
+            renderer.add_polygon(
+                points,
+                fill=p["colors"][i % len(p["colors"])],
+                opacity=p["opacities"][i % len(p["opacities"])]
+            )
+
+    for renderer in renderers:
+        renderer.save()
+
+
+if __name__ == "__main__":
+    make_background(output_files, default_parameters())
+    for output_file in output_files:
+        print(f"Saved {output_file}")
@@ -0,0 +1,125 @@
+"""Array based polygon engine shared by the background scripts.
+
+Polygons are (N, 2) float arrays of x, y vertices, and every step
+(midpoints, growing, rotating, resampling) is done as whole-array operations.
+"""
+import numpy as np
+
+
+def regular_polygon(cx, cy, r, n, angle_offset=0.0, y_scale=1.0):
+    """Vertices of a regular n-sided polygon centred on (cx, cy).
+
+    Args:
+        cx, cy (float): centre of the polygon
+        r (float | array): radius, or one radius per vertex (e.g. with jitter)
+        n (int): number of sides
+        angle_offset (float): rotation of the first vertex, in radians
+        y_scale (float): vertical squash, height / width for the game background
+
+    Returns:
+        np.ndarray: (n, 2) vertices
+    """
+    angles = 2 * np.pi * np.arange(n) / n + angle_offset
+    r = np.asarray(r, dtype=float)
+    vertices = np.empty((n, 2))
+    vertices[:, 0] = cx + r * np.cos(angles)
+    vertices[:, 1] = cy + r * np.sin(angles) * y_scale
+    return vertices
+
+
+def centroid(vertices):
+    """Mean of the vertices (as used by the original grow_polygon loop)."""
+    return vertices.mean(axis=0)
+
+
+def midpoints(vertices):
+    """Midpoint of every edge, edge i going from vertex i to vertex i + 1 (wrapping)."""
+    return (vertices + np.roll(vertices, -1, axis=0)) / 2
+
+
+def rotate(vertices, center, angle):
+    """Rotate vertices around center by angle radians."""
+    c, s = np.cos(angle), np.sin(angle)
+    rotation = np.array([[c, s], [-s, c]])
+    return center + (vertices - center) @ rotation
+
+
+def scale_outward(vertices, center, increment):
+    """Push each vertex increment pixels further away from center, along its own direction."""
+    offsets = vertices - center
+    lengths = np.hypot(offsets[:, 0], offsets[:, 1])
+    return center + offsets * ((lengths + increment) / lengths)[:, None]
+
+
+def grow_polygon(vertices, radius_increment, rotation_deg):
+    """Array version of 28_layers.py grow_polygon.
+
+    Keeps every vertex and inserts after each one the midpoint of its edge,
+    pushed radius_increment outward and rotated rotation_deg around the centroid.
+
+    Returns:
+        np.ndarray: (2N, 2) vertices
+    """
+    center = centroid(vertices)
+    grown = scale_outward(midpoints(vertices), center, radius_increment)
+    grown = rotate(grown, center, np.radians(rotation_deg))
+
+    new_vertices = np.empty((2 * len(vertices), 2))
+    new_vertices[0::2] = vertices
+    new_vertices[1::2] = grown
+    return new_vertices
+
+
+def resample_polygon(vertices, target_count):
+    """Resample a closed polygon to target_count points evenly spaced along its perimeter."""
+    if len(vertices) <= target_count:
+        return vertices
+    ring = np.vstack([vertices, vertices[:1]])
+    edges = np.diff(ring, axis=0)
+    cumulative = np.concatenate([[0.0], np.cumsum(np.hypot(edges[:, 0], edges[:, 1]))])
+    if cumulative[-1] == 0:
+        return vertices[:target_count]
+
+    distances = np.arange(target_count) * (cumulative[-1] / target_count)
+    resampled = np.empty((target_count, 2))
+    resampled[:, 0] = np.interp(distances, cumulative, ring[:, 0])
+    resampled[:, 1] = np.interp(distances, cumulative, ring[:, 1])
+    return resampled
+
+
+def simplify_polygon(vertices, tolerance):
+    """Ramer-Douglas-Peucker simplification of a closed polygon.
+
+    Only keeps the vertices that move the outline by more than tolerance pixels.
+    The split points are found iteratively, the distances for each span in one array pass.
+    """
+    n = len(vertices)
+    if n < 4:
+        return vertices
+    # Split the ring at vertex 0 and at the vertex farthest from it
+    far = int(np.argmax(((vertices - vertices[0]) ** 2).sum(axis=1)))
+    ring = np.vstack([vertices, vertices[:1]])
+    keep = np.zeros(n + 1, dtype=bool)
+    keep[[0, far, n]] = True
+
+    stack = [(0, far), (far, n)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        a, b = ring[start], ring[end]
+        span = ring[start + 1:end]
+        d = b - a
+        seg_length = np.hypot(d[0], d[1])
+        if seg_length:
+            dist = np.abs(d[0] * (a[1] - span[:, 1]) - d[1] * (a[0] - span[:, 0])) / seg_length
+        else:
+            dist = np.hypot(span[:, 0] - a[0], span[:, 1] - a[1])
+        index = int(np.argmax(dist))
+        if dist[index] > tolerance:
+            index += start + 1
+            keep[index] = True
+            stack.append((start, index))
+            stack.append((index, end))
+
+    return ring[:n][keep[:n]]
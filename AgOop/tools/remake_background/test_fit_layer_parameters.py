@@ -0,0 +1,57 @@
+"""Round trips of polygon_engine.grow_polygon layers through fit_layer_parameters.
+
+Run with: python -m pytest test_fit_layer_parameters.py
+"""
+import numpy as np
+import pytest
+
+from fit_layer_parameters import fit_layers
+from polygon_engine import grow_polygon, regular_polygon
+
+
+def grown_layers(num_layers, radius_increment, rotation_deg, y_scale=557 / 800):
+    """The full-growth layers of 28_layers.py, innermost first."""
+    layers = [regular_polygon(400, 278.5, 60, 10, y_scale=y_scale)]
+    for _ in range(num_layers - 1):
+        layers.append(grow_polygon(layers[-1], radius_increment, rotation_deg))
+    return layers
+
+
+@pytest.mark.parametrize("radius_increment, rotation_deg", [(15, 30), (8, -45), (25, 170), (0.5, 0)])
+def test_recovers_growth_parameters(radius_increment, rotation_deg):
+    fit = fit_layers(grown_layers(7, radius_increment, rotation_deg))
+
+    np.testing.assert_allclose(fit["radius_increment"], radius_increment, atol=1e-9)
+    np.testing.assert_allclose(fit["rotation_deg"], rotation_deg, atol=1e-9)
+    assert fit["median_radius_increment"] == pytest.approx(radius_increment)
+    assert fit["median_rotation_deg"] == pytest.approx(rotation_deg)
+    assert fit["height_width"] == pytest.approx(557 / 800)
+
+
+def test_recovers_parameters_from_rounded_svg(tmp_path):
+    pytest.importorskip("svgpathtools")
+    from background_renderer import make_renderer
+    from extract_vertices_angles_from_svg import extract_layers
+
+    svg_file = str(tmp_path / "layers.svg")
+    renderer = make_renderer(svg_file, 800, 557)
+    for layer in grown_layers(6, 15, 30):
+        renderer.add_polygon(layer, fill="#ff9900")
+    renderer.save()
+
+    fit = fit_layers([np.array(points) for points in extract_layers([svg_file])])
+    np.testing.assert_allclose(fit["radius_increment"], 15, atol=0.01)
+    np.testing.assert_allclose(fit["rotation_deg"], 30, atol=0.05)
+    assert fit["height_width"] == pytest.approx(557 / 800, abs=0.01)
+
+
+def test_layers_not_grown_are_left_out():
+    layers = grown_layers(4, 15, 30)
+    # A rigidly scaled copy instead of a grown layer
+    layers.append(layers[-1] * 1.2)
+    fit = fit_layers(layers)
+
+    assert np.isnan(fit["radius_increment"][-1]) and np.isnan(fit["rotation_deg"][-1])
+    assert fit["median_radius_increment"] == pytest.approx(15)
+    assert fit["median_rotation_deg"] == pytest.approx(30)
+    assert fit["height_width"] == pytest.approx(557 / 800)